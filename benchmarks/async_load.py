@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+'''
+Sends concurrent requests to create_xlsx_async(), and reports latency percentiles,
+and how long the event loop was blocked. For comparison, the same requests are
+made by calling the blocking create_xlsx() directly from coroutines.
+
+From the root of the repo:
+    benchmarks/async_load.py --requests 50 --fields 200
+'''
+
+import argparse
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template import create_xlsx  # noqa: E402
+from tableschema_to_template.create_xlsx_async import AsyncCreator  # noqa: E402
+
+
+def make_schema(field_count, seed):
+    # Each request gets a different schema, so no cache makes it cheap.
+    return {
+        'fields': [
+            {
+                'name': f'field_{seed}_{i}',
+                'description': f'Field number {i}',
+                'type': 'integer',
+                'constraints': {'minimum': i}
+            }
+            for i in range(field_count)
+        ]
+    }
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def watch_loop(stop, interval=0.01):
+    '''
+    Returns the longest time the loop took to come back to a sleeping coroutine.
+    '''
+    worst = 0
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, perf_counter() - start - interval)
+    return worst
+
+
+async def load(create, request_count, field_count):
+    schemas = [make_schema(field_count, i) for i in range(request_count)]
+
+    # All requests arrive at once, so latency is measured from the same start.
+    async def timed(table_schema):
+        await create(table_schema)
+        return perf_counter() - start
+
+    stop = asyncio.Event()
+    watcher = asyncio.ensure_future(watch_loop(stop))
+    await asyncio.sleep(0)
+    start = perf_counter()
+    latencies = await asyncio.gather(*[timed(table_schema) for table_schema in schemas])
+    stop.set()
+    return latencies, await watcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--fields', type=int, default=200)
+    parser.add_argument('--max_concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    async def blocking(table_schema):
+        return create_xlsx(table_schema, None)
+
+    thread_creator = AsyncCreator(max_concurrency=args.max_concurrency)
+    process_creator = AsyncCreator(
+        max_concurrency=args.max_concurrency,
+        executor=ProcessPoolExecutor(max_workers=args.max_concurrency)
+    )
+    print(f'{args.requests} concurrent requests, {args.fields} fields each:')
+    for name, create in [
+        ('blocking create_xlsx', blocking),
+        ('AsyncCreator, threads', thread_creator.create_xlsx),
+        ('AsyncCreator, processes', process_creator.create_xlsx)
+    ]:
+        loop = asyncio.new_event_loop()
+        latencies, worst_block = loop.run_until_complete(
+            load(create, args.requests, args.fields))
+        loop.close()
+        print(
+            f'  {name}: p50 {percentile(latencies, 50):.3f}s, '
+            f'p99 {percentile(latencies, 99):.3f}s, '
+            f'loop blocked up to {worst_block:.3f}s'
+        )
+    thread_creator.shutdown()
+    process_creator.shutdown()
+
+
+if __name__ == '__main__':
+    main()
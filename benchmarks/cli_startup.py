@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+'''
+Times cold runs of ts2xl.py, and cold parses of the embedded meta-schema,
+each in a fresh interpreter.
+
+From the root of the repo:
+    benchmarks/cli_startup.py --runs 10
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+root = Path(__file__).parent.parent
+env = {
+    **os.environ,
+    'PYTHONPATH': os.pathsep.join([str(root), str(root / 'tableschema_to_template')])
+}
+
+parse_snippets = {
+    'yaml': 'from yaml import safe_load as load',
+    'json': 'from json import loads as load'
+}
+
+
+def _time_run(args):
+    start = perf_counter()
+    subprocess.run(args, env=env, check=True, stderr=subprocess.DEVNULL)
+    return perf_counter() - start
+
+
+def time_cli(runs):
+    with TemporaryDirectory() as tmp:
+        return [
+            _time_run([
+                sys.executable, str(root / 'tableschema_to_template/ts2xl.py'),
+                str(root / 'tests/fixtures/schema.yaml'),
+                str(Path(tmp) / f'{i}.xlsx')
+            ])
+            for i in range(runs)
+        ]
+
+
+def time_parse(runs, parser):
+    code = (
+        f'{parse_snippets[parser]}; '
+        'from tableschema_to_template.validate_schema import _table_schema_schema; '
+        'load(_table_schema_schema)'
+    )
+    return [_time_run([sys.executable, '-c', code]) for i in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, times in [
+        ('import + meta-schema parse with yaml', time_parse(args.runs, 'yaml')),
+        ('import + meta-schema parse with json', time_parse(args.runs, 'json')),
+        ('ts2xl.py on tests/fixtures/schema.yaml', time_cli(args.runs))
+    ]:
+        print(f'{name}: median {median(times):.3f}s, min {min(times):.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+'''
+Compares peak memory for a long vocabulary given inline, as "enum",
+and given as a file, with "enumFile". Each case runs in a fresh process.
+
+From the root of the repo:
+    benchmarks/enum_file.py --values 300000
+'''
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template import create_xlsx  # noqa: E402
+
+
+def run_case(case, enum_path, xlsx_path):
+    start = perf_counter()
+    if case == 'enum':
+        # Reading the list is part of the cost of inlining it.
+        enum = Path(enum_path).read_text().splitlines()
+        constraints = {'enum': enum}
+    else:
+        constraints = {'enumFile': enum_path}
+    schema = {'fields': [
+        {'name': 'term', 'description': 'Ontology term', 'constraints': constraints}
+    ]}
+    create_xlsx(schema, xlsx_path)
+    seconds = perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(json.dumps({'seconds': seconds, 'max_rss': max_rss}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--values', type=int, default=300000)
+    parser.add_argument('--case', choices=['enum', 'enumFile'], help=argparse.SUPPRESS)
+    parser.add_argument('--enum_path', help=argparse.SUPPRESS)
+    parser.add_argument('--xlsx_path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.enum_path, args.xlsx_path)
+        return
+
+    with TemporaryDirectory() as tmp:
+        enum_path = Path(tmp) / 'terms.txt'
+        enum_path.write_text(''.join(f'TERM:{i:07}\n' for i in range(args.values)))
+        print(f'{args.values} values:')
+        for case in ['enum', 'enumFile']:
+            result = subprocess.run(
+                [
+                    sys.executable, __file__, '--case', case,
+                    '--enum_path', str(enum_path),
+                    '--xlsx_path', str(Path(tmp) / f'{case}.xlsx')
+                ],
+                stdout=subprocess.PIPE, universal_newlines=True, check=True
+            )
+            stats = json.loads(result.stdout)
+            print(
+                f'  {case}: {stats["seconds"]:.2f}s, '
+                f'peak memory (max RSS) {stats["max_rss"] / 2**20:.1f}MB'
+            )
+
+
+if __name__ == '__main__':
+    main()
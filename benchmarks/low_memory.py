@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+'''
+Compares peak memory and time for a wide schema, with and without low_memory.
+Each case runs in a fresh process.
+
+From the root of the repo:
+    benchmarks/low_memory.py --fields 16384
+'''
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic_schema import make_schema  # noqa: E402
+from tableschema_to_template import create_xlsx  # noqa: E402
+
+
+def run_case(field_count, enum_size, enum_shared, low_memory, xlsx_path):
+    table_schema = make_schema(field_count, enum_size=enum_size, enum_shared=enum_shared)
+    start = perf_counter()
+    create_xlsx(table_schema, xlsx_path, low_memory=low_memory)
+    seconds = perf_counter() - start
+    print(json.dumps({
+        'seconds': seconds,
+        # ru_maxrss is in kilobytes on Linux.
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'output_bytes': Path(xlsx_path).stat().st_size
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fields', type=int, default=16384)
+    parser.add_argument('--enum_size', type=int, default=10)
+    parser.add_argument(
+        '--enum_shared', type=float, default=0.5,
+        help='Fraction of enum fields that share one list; The rest get a sheet each.')
+    parser.add_argument('--case', choices=['default', 'low_memory'], help=argparse.SUPPRESS)
+    parser.add_argument('--xlsx_path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(
+            args.fields, args.enum_size, args.enum_shared,
+            args.case == 'low_memory', args.xlsx_path)
+        return
+
+    print(f'{args.fields} fields:')
+    with TemporaryDirectory() as tmp:
+        for case in ['default', 'low_memory']:
+            result = subprocess.run(
+                [
+                    sys.executable, __file__, '--case', case,
+                    '--fields', str(args.fields),
+                    '--enum_size', str(args.enum_size),
+                    '--enum_shared', str(args.enum_shared),
+                    '--xlsx_path', str(Path(tmp) / f'{case}.xlsx')
+                ],
+                stdout=subprocess.PIPE, universal_newlines=True, check=True
+            )
+            stats = json.loads(result.stdout)
+            print(
+                f'  {case}: {stats["seconds"]:.2f}s, '
+                f'peak memory (max RSS) {stats["max_rss"] / 2**20:.1f}MB, '
+                f'{stats["output_bytes"] / 2**20:.1f}MB output'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+'''
+Shows the effect of max_rows on the size of the sheet XML,
+and, if LibreOffice is installed, on the time to open the file:
+"soffice --headless --convert-to csv" has to load and recalculate it.
+
+From the root of the repo:
+    benchmarks/max_rows.py --fields 200 --max_rows 1000 1048575
+'''
+
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from zipfile import ZipFile
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template import create_xlsx  # noqa: E402
+
+
+def make_schema(field_count):
+    field_kinds = [
+        {'type': 'number', 'constraints': {'minimum': 0}},
+        {'type': 'integer', 'constraints': {'minimum': 1, 'maximum': 10}},
+        {'type': 'boolean'},
+        {'constraints': {'enum': ['A', 'B', 'C']}}
+    ]
+    return {
+        'fields': [
+            {
+                'name': f'field_{i}',
+                'description': f'Field number {i}',
+                **field_kinds[i % len(field_kinds)]
+            }
+            for i in range(field_count)
+        ]
+    }
+
+
+def time_open(soffice, xlsx_path, out_dir):
+    start = perf_counter()
+    subprocess.run(
+        [soffice, '--headless', '--convert-to', 'csv', '--outdir', out_dir, xlsx_path],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fields', type=int, default=200)
+    parser.add_argument('--max_rows', type=int, nargs='+', default=[1000, 1048575])
+    args = parser.parse_args()
+
+    soffice = shutil.which('soffice') or shutil.which('libreoffice')
+    if not soffice:
+        print('LibreOffice not found: Only reporting sizes.')
+    table_schema = make_schema(args.fields)
+    with TemporaryDirectory() as tmp:
+        for max_rows in args.max_rows:
+            xlsx_path = str(Path(tmp) / f'{max_rows}.xlsx')
+            create_xlsx(table_schema, xlsx_path, max_rows=max_rows)
+            with ZipFile(xlsx_path) as zip_handle:
+                sheet_size = zip_handle.getinfo('xl/worksheets/sheet1.xml').file_size
+            line = f'max_rows={max_rows}: sheet1.xml is {sheet_size} bytes'
+            if soffice:
+                line += f', opened in {time_open(soffice, xlsx_path, tmp):.2f}s'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+'''
+Compares the throughput, in MB/s, of reading the checked columns of a wide TSV
+with read_tsv_columns(), and with the csv module, line by line.
+Also times validate_data() on the same file.
+
+From the root of the repo:
+    benchmarks/read_tsv.py --rows 200000 --columns 30 --checked 3
+'''
+
+import argparse
+import csv
+import sys
+from itertools import islice
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template.read_tsv import read_tsv_columns, read_tsv_header  # noqa: E402
+from tableschema_to_template.validate_data import validate_data  # noqa: E402
+
+
+def make_schema(column_count, checked_count):
+    # Unchecked columns are free text; Checked columns are numbers.
+    return {'fields': [
+        {'name': f'c{i}', 'description': 'd', 'type': 'number' if i < checked_count else 'string'}
+        for i in range(column_count)
+    ]}
+
+
+def write_tsv(tsv_path, row_count, column_count):
+    with open(tsv_path, 'w') as tsv_file:
+        tsv_file.write('\t'.join(f'c{i}' for i in range(column_count)) + '\n')
+        for row in range(row_count):
+            tsv_file.write('\t'.join(f'{row}.{i}' for i in range(column_count)) + '\n')
+
+
+def read_with_csv(tsv_path, indexes):
+    with open(tsv_path, newline='', encoding='utf-8-sig') as tsv_file:
+        rows = csv.reader(tsv_file, delimiter='\t')
+        next(rows)
+        while True:
+            batch = list(islice(rows, 10000))
+            if not batch:
+                return
+            [[row[i] for row in batch] for i in indexes]
+
+
+def read_with_mmap(tsv_path, indexes):
+    header, start = read_tsv_header(tsv_path)
+    for row_count, columns in read_tsv_columns(tsv_path, indexes, start):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--columns', type=int, default=30)
+    parser.add_argument('--checked', type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tsv_path = str(Path(tmp) / 'data.tsv')
+        write_tsv(tsv_path, args.rows, args.columns)
+        mb = Path(tsv_path).stat().st_size / 1e6
+        print(f'{args.rows} rows, {args.columns} columns, {args.checked} checked, {mb:.0f}MB:')
+        indexes = list(range(args.checked))
+        for name, read in [('csv module', read_with_csv), ('mmap', read_with_mmap)]:
+            start = perf_counter()
+            read(tsv_path, indexes)
+            seconds = perf_counter() - start
+            print(f'  read, {name}: {seconds:.2f}s, {mb / seconds:.0f}MB/s')
+
+        table_schema = make_schema(args.columns, args.checked)
+        start = perf_counter()
+        count = sum(1 for problem in validate_data(table_schema, tsv_path))
+        seconds = perf_counter() - start
+        print(f'  validate_data: {seconds:.2f}s, {mb / seconds:.0f}MB/s, {count} problems')
+
+
+if __name__ == '__main__':
+    main()
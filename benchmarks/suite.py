@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+'''
+Times validate_schema() and create_xlsx() on synthetic schemas of different
+shapes, and records peak memory and output size. Each case runs in a fresh
+process. Results are JSON; With --baseline, cases that got worse by more than
+--tolerance are listed, and the exit status is 1.
+
+From the root of the repo:
+    benchmarks/suite.py --baseline benchmarks/baseline.json
+To update the baseline, on the same machine:
+    benchmarks/suite.py --output benchmarks/baseline.json
+'''
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic_schema import make_schema  # noqa: E402
+
+
+# Each case is the arguments to make_schema().
+cases = {
+    'fields_10': {'field_count': 10},
+    'fields_100': {'field_count': 100},
+    'fields_1000': {'field_count': 1000},
+    'fields_16384': {'field_count': 16384},
+    **{
+        f'type_{type_mix}': {'field_count': 1000, 'type_mix': type_mix}
+        for type_mix in ['string', 'number', 'integer', 'boolean', 'enum']
+    },
+    'enum_size_1000': {'field_count': 100, 'type_mix': 'enum', 'enum_size': 1000},
+    'enum_unshared': {'field_count': 1000, 'type_mix': 'enum', 'enum_shared': 0},
+    'enum_all_shared': {'field_count': 1000, 'type_mix': 'enum', 'enum_shared': 1},
+    'description_1000': {'field_count': 1000, 'description_length': 1000}
+}
+
+metrics = ['validate_seconds', 'create_seconds', 'max_rss', 'output_bytes']
+
+
+def run_case(name, xlsx_path):
+    from tableschema_to_template import create_xlsx
+    from tableschema_to_template.validate_schema import get_validator, validate_schema
+    table_schema = make_schema(**cases[name])
+    # Building the validator is a one-time cost, measured by cli_startup.py.
+    get_validator()
+
+    start = perf_counter()
+    validate_schema(table_schema, use_cache=False)
+    validate_seconds = perf_counter() - start
+
+    start = perf_counter()
+    create_xlsx(table_schema, xlsx_path, idempotent=True, cache_validation=False)
+    create_seconds = perf_counter() - start
+
+    print(json.dumps({
+        'validate_seconds': validate_seconds,
+        'create_seconds': create_seconds,
+        # ru_maxrss is in kilobytes on Linux.
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'output_bytes': Path(xlsx_path).stat().st_size
+    }))
+
+
+def measure(name, runs, tmp):
+    '''
+    Runs the case in fresh processes, and returns the median of each metric.
+    '''
+    samples = []
+    for run in range(runs):
+        result = subprocess.run(
+            [
+                sys.executable, __file__, '--case', name,
+                '--xlsx_path', str(Path(tmp) / f'{name}-{run}.xlsx')
+            ],
+            stdout=subprocess.PIPE, universal_newlines=True, check=True
+        )
+        samples.append(json.loads(result.stdout))
+    return {metric: median(sample[metric] for sample in samples) for metric in metrics}
+
+
+def compare(results, baseline, tolerance, min_seconds=0.05):
+    '''
+    Returns a line for each metric that is worse than baseline by more than tolerance.
+    Timings that changed by less than min_seconds are noise, and are ignored.
+
+    >>> compare(
+    ...     {'a': {'create_seconds': 1.5, 'validate_seconds': 0.02, 'max_rss': 100}},
+    ...     {'a': {'create_seconds': 1, 'validate_seconds': 0.01, 'max_rss': 100}, 'b': {}},
+    ...     0.2
+    ... )
+    ['a: create_seconds 1 -> 1.5 (+50%)']
+    '''
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric, value in result.items():
+            before = baseline[name].get(metric)
+            if before is None:
+                continue
+            if metric.endswith('_seconds') and value - before < min_seconds:
+                continue
+            if before > 0 and value > before * (1 + tolerance):
+                change = (value - before) / before
+                regressions.append(f'{name}: {metric} {before:g} -> {value:g} ({change:+.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'names', nargs='*', metavar='CASE',
+        help=f'Cases to run; Defaults to all: {", ".join(cases)}')
+    parser.add_argument('--runs', type=int, default=3, help='Report the median of N runs.')
+    parser.add_argument('--output', help='Write results to this file, instead of stdout.')
+    parser.add_argument('--baseline', help='Compare results to this file.')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help='Fraction by which a metric may exceed the baseline.')
+    parser.add_argument('--case', choices=cases, help=argparse.SUPPRESS)
+    parser.add_argument('--xlsx_path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.xlsx_path)
+        return 0
+    unknown = [name for name in args.names if name not in cases]
+    if unknown:
+        parser.error(f'Unknown cases: {", ".join(unknown)}')
+
+    results = {}
+    with TemporaryDirectory() as tmp:
+        for name in args.names or cases:
+            results[name] = measure(name, args.runs, tmp)
+            print(f'{name}: {json.dumps(results[name])}', file=sys.stderr)
+    report = json.dumps({
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + '\n')
+    else:
+        print(report)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+        print(f'No regressions beyond {args.tolerance:.0%}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
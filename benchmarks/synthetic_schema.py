@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+'''
+Generates a Table Schema for benchmarks, and prints it as JSON.
+
+From the root of the repo:
+    benchmarks/synthetic_schema.py --fields 1000 --enum_size 50 > /tmp/schema.json
+'''
+
+import argparse
+import json
+import random
+
+
+type_mixes = {
+    'mixed': ['string', 'number', 'integer', 'boolean', 'enum'],
+    'string': ['string'],
+    'number': ['number'],
+    'integer': ['integer'],
+    'boolean': ['boolean'],
+    'enum': ['enum']
+}
+
+
+def make_schema(
+    field_count, type_mix='mixed', enum_size=10, enum_shared=0.5,
+    description_length=50, seed=0
+):
+    '''
+    Returns a Table Schema with field_count fields, cycling through the types in type_mix.
+    A fraction enum_shared of enum fields use the same list, so they share a sheet;
+    The rest each have their own list of enum_size values.
+    The same arguments always return the same schema.
+    '''
+    rng = random.Random(seed)
+    kinds = type_mixes[type_mix]
+    words = ['donor', 'sample', 'tissue', 'assay', 'organ', 'section', 'protocol', 'lab']
+    shared_enum = [f'shared value {i}' for i in range(enum_size)]
+    fields = []
+    for i in range(field_count):
+        kind = kinds[i % len(kinds)]
+        # Every word is at least three letters and a space, so this is enough.
+        description = ' '.join(rng.choice(words) for _ in range(description_length // 4 + 1))
+        field = {
+            'name': f'{rng.choice(words)}_{i}',
+            'description': description[:description_length] or 'x'
+        }
+        if kind == 'enum':
+            if rng.random() < enum_shared:
+                field['constraints'] = {'enum': shared_enum}
+            else:
+                field['constraints'] = {'enum': [f'value {i}.{j}' for j in range(enum_size)]}
+        elif kind == 'number':
+            field['type'] = 'number'
+            field['constraints'] = {
+                'minimum': rng.randint(-100, 0),
+                'maximum': rng.randint(1, 100)
+            }
+        elif kind == 'integer':
+            field['type'] = 'integer'
+            field['constraints'] = {'minimum': 0}
+        elif kind == 'boolean':
+            field['type'] = 'boolean'
+        else:
+            field['type'] = 'string'
+        fields.append(field)
+    return {'fields': fields}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fields', type=int, default=100)
+    parser.add_argument('--type_mix', choices=type_mixes, default='mixed')
+    parser.add_argument('--enum_size', type=int, default=10)
+    parser.add_argument('--enum_shared', type=float, default=0.5)
+    parser.add_argument('--description_length', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(make_schema(
+        args.fields, type_mix=args.type_mix, enum_size=args.enum_size,
+        enum_shared=args.enum_shared, description_length=args.description_length,
+        seed=args.seed
+    ), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+'''
+Times validate_data() on a long TSV of numbers and booleans, and compares
+with checking each cell with get_error(), one at a time.
+Column checks use NumPy if it is installed.
+With --workers N, also times checking chunks of the file in N processes.
+
+From the root of the repo:
+    benchmarks/validate_data.py --rows 1000000
+'''
+
+import argparse
+import csv
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template import validate_columns  # noqa: E402
+from tableschema_to_template.validate_data import validate_data  # noqa: E402
+from tableschema_to_template.validation_factory import get_validation  # noqa: E402
+
+
+table_schema = {'fields': [
+    {'name': 'number', 'description': 'n', 'type': 'number', 'constraints': {'minimum': 0}},
+    {'name': 'integer', 'description': 'i', 'type': 'integer',
+     'constraints': {'minimum': 1, 'maximum': 10}},
+    {'name': 'boolean', 'description': 'b', 'type': 'boolean'}
+]}
+
+
+def write_tsv(tsv_path, row_count):
+    with open(tsv_path, 'w') as tsv_file:
+        tsv_file.write('number\tinteger\tboolean\n')
+        for i in range(row_count):
+            # One row in a thousand has a bad integer.
+            integer = 11 if i % 1000 == 0 else i % 10 + 1
+            tsv_file.write(f'{i / 4}\t{integer}\t{"TRUE" if i % 2 else "FALSE"}\n')
+
+
+def validate_cell_by_cell(tsv_path):
+    validations = [get_validation(field, None) for field in table_schema['fields']]
+    with open(tsv_path, newline='') as tsv_file:
+        rows = csv.reader(tsv_file, delimiter='\t')
+        next(rows)
+        for values in rows:
+            for validation, value in zip(validations, values):
+                if value:
+                    validation.get_error(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, nargs='*', default=[], metavar='N')
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        tsv_path = str(Path(tmp) / 'data.tsv')
+        write_tsv(tsv_path, args.rows)
+        print(f'{args.rows} rows:')
+
+        start = perf_counter()
+        validate_cell_by_cell(tsv_path)
+        print(f'  cell by cell: {perf_counter() - start:.2f}s')
+
+        numpy = validate_columns.numpy
+        cases = [('columns, NumPy', numpy)] if numpy else []
+        cases.append(('columns, plain Python', None))
+        for name, module in cases:
+            validate_columns.numpy = module
+            start = perf_counter()
+            count = sum(1 for problem in validate_data(table_schema, tsv_path))
+            print(f'  {name}: {perf_counter() - start:.2f}s, {count} problems')
+        validate_columns.numpy = numpy
+
+        for workers in args.workers:
+            start = perf_counter()
+            count = sum(1 for problem in validate_data(table_schema, tsv_path, workers=workers))
+            print(f'  columns, {workers} workers: {perf_counter() - start:.2f}s, {count} problems')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+'''
+Compares validate_schema() against plain jsonschema.validate()
+on wide schemas with a mix of field types.
+
+From the root of the repo:
+    benchmarks/validate_schema.py --fields 5000
+'''
+
+import argparse
+import sys
+from json import loads
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from jsonschema import validate
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template.validate_schema import (  # noqa: E402
+    validate_schema, get_validator, _table_schema_schema
+)
+
+
+def make_schema(field_count):
+    field_kinds = [
+        {'type': 'string'},
+        {'type': 'number', 'constraints': {'minimum': 0}},
+        {'type': 'integer', 'constraints': {'minimum': 1, 'maximum': 10}},
+        {'type': 'boolean'},
+        {'type': 'date'},
+        {'type': 'any'},
+        {'constraints': {'enum': ['A', 'B', 'C']}}
+    ]
+    return {
+        'fields': [
+            {
+                'name': f'field_{i}',
+                'description': f'Field number {i}',
+                **field_kinds[i % len(field_kinds)]
+            }
+            for i in range(field_count)
+        ]
+    }
+
+
+def _time(fn, runs):
+    times = []
+    for i in range(runs):
+        start = perf_counter()
+        fn()
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fields', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    table_schema = make_schema(args.fields)
+    table_schema_schema = loads(_table_schema_schema)
+    get_validator()  # Warm up, so the one-time build isn't counted.
+    validate_schema(table_schema)
+
+    before = _time(lambda: validate(table_schema, table_schema_schema), args.runs)
+    after = _time(lambda: validate_schema(table_schema), args.runs)
+    print(f'{args.fields} fields, median of {args.runs} runs:')
+    print(f'  jsonschema.validate: {before:.3f}s')
+    print(f'  validate_schema:     {after:.3f}s ({before / after:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+'''
+Compares xlsx_to_tsv() with openpyxl, if it is installed, on a long sheet:
+Time and peak memory to write it all as TSV. Each case runs in a fresh process.
+By default, strings are shared, as when Excel saves a file; Making the sheet
+takes a while, and a few GB of memory, but it is kept for reuse.
+
+From the root of the repo:
+    benchmarks/xlsx_to_tsv.py --rows 1000000
+'''
+
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import gettempdir
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tableschema_to_template.xlsx_to_tsv import xlsx_to_tsv  # noqa: E402
+
+
+def make_xlsx(xlsx_path, row_count, inline_strings):
+    from xlsxwriter import Workbook
+    # constant_memory writes strings inline, instead of to the shared table.
+    workbook = Workbook(xlsx_path, {'constant_memory': inline_strings})
+    sheet = workbook.add_worksheet('Export this as TSV')
+    sheet.write_row(0, 0, ['abc', 'xyz', 'string', 'number', 'integer', 'boolean'])
+    for i in range(1, row_count + 1):
+        sheet.write_row(i, 0, ['A', 'Y', f'sample {i}', i / 4, i % 12, i % 2 == 0])
+    workbook.close()
+
+
+def openpyxl_to_tsv(xlsx_path, tsv_file):
+    from openpyxl import load_workbook
+    workbook = load_workbook(xlsx_path, read_only=True)
+    writer = csv.writer(tsv_file, delimiter='\t', lineterminator='\n')
+    for values in workbook.worksheets[0].iter_rows(values_only=True):
+        writer.writerow(['' if value is None else value for value in values])
+    workbook.close()
+
+
+def run_case(case, xlsx_path):
+    start = perf_counter()
+    with open(os.devnull, 'w', newline='') as tsv_file:
+        if case == 'xlsx_to_tsv':
+            xlsx_to_tsv(xlsx_path, tsv_file)
+        else:
+            openpyxl_to_tsv(xlsx_path, tsv_file)
+    print(json.dumps({
+        'seconds': perf_counter() - start,
+        # ru_maxrss is in kilobytes on Linux.
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument(
+        '--inline_strings', action='store_true',
+        help='Write strings in cells, instead of a shared table: Quicker to make.')
+    parser.add_argument(
+        '--case', choices=['make', 'xlsx_to_tsv', 'openpyxl'], help=argparse.SUPPRESS)
+    parser.add_argument('--xlsx_path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case == 'make':
+        make_xlsx(args.xlsx_path, args.rows, args.inline_strings)
+        return
+    if args.case:
+        run_case(args.case, args.xlsx_path)
+        return
+
+    kind = 'inline' if args.inline_strings else 'shared'
+    xlsx_path = Path(gettempdir()) / f'ts2xl-benchmark-{args.rows}-{kind}.xlsx'
+    if not xlsx_path.exists():
+        print(f'Making {xlsx_path}...')
+        # In its own process, so its memory use doesn't count against the readers:
+        # Peak memory carries over from parent to child.
+        subprocess.run(
+            [
+                sys.executable, __file__, '--case', 'make', '--rows', str(args.rows),
+                '--xlsx_path', str(xlsx_path)
+            ] + (['--inline_strings'] if args.inline_strings else []),
+            check=True
+        )
+    cases = ['xlsx_to_tsv']
+    try:
+        import openpyxl  # noqa: F401
+        cases.append('openpyxl')
+    except ImportError:
+        print('openpyxl not installed: Skipping it.')
+
+    print(f'{args.rows} rows, {xlsx_path.stat().st_size / 2**20:.1f}MB, {kind} strings:')
+    for case in cases:
+        result = subprocess.run(
+            [sys.executable, __file__, '--case', case, '--xlsx_path', str(xlsx_path)],
+            stdout=subprocess.PIPE, universal_newlines=True, check=True
+        )
+        stats = json.loads(result.stdout)
+        print(
+            f'  {case}: {stats["seconds"]:.2f}s, {args.rows / stats["seconds"]:.0f} rows/s, '
+            f'peak memory (max RSS) {stats["max_rss"] / 2**20:.1f}MB'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,3 @@
 # Export from the top level:
 from tableschema_to_template.create_xlsx import create_xlsx  # noqa: F401
+from tableschema_to_template.create_many import create_many  # noqa: F401
@@ -0,0 +1,112 @@
+import os
+from collections import namedtuple
+from time import perf_counter
+
+from tableschema_to_template.create_xlsx import create_xlsx
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.validate_schema import get_validator
+from tableschema_to_template.validation_factory import resolve_enum_files
+
+
+JobResult = namedtuple('JobResult', ['xlsx_path', 'value', 'seconds', 'error'])
+
+
+def create_many(jobs, workers=None):
+    '''
+    Creates Excel files for many Table Schemas, in a pool of processes.
+
+    Args:
+        jobs: List of dicts of create_xlsx() arguments; schema_path may replace table_schema.
+        workers: Number of processes; Defaults to CPU count. If 1, jobs run in this process.
+
+    Returns:
+        List of JobResult(xlsx_path, value, seconds, error), in the same order as the jobs.
+        "value" is what create_xlsx() returned; "error" is a message if the job failed.
+    '''
+    # Build the validator before the pool forks, so workers inherit it.
+    # Otherwise, each worker builds it once, on its first job.
+    get_validator()
+    if workers == 1 or not jobs:
+        return [_run_job(job) for job in jobs]
+    # Imported here, rather than at the top, because multiprocessing is slow to import.
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_job, job) for job in jobs]
+        results = [_get_result(future, job) for future, job in zip(futures, jobs)]
+
+    # If a job kills its worker, every job not yet finished fails with it:
+    # Run those again, each in its own process, so only the job at fault fails.
+    broken = [
+        i for i, future in enumerate(futures)
+        if isinstance(future.exception(), BrokenProcessPool)
+    ]
+    retried = _run_isolated([jobs[i] for i in broken], workers or os.cpu_count() or 1)
+    for i, result in zip(broken, retried):
+        results[i] = result
+    return results
+
+
+def _run_isolated(jobs, workers):
+    '''
+    Runs each job in a pool of one process, with up to "workers" pools at a time.
+    '''
+    from concurrent.futures import ProcessPoolExecutor
+    results = []
+    for start in range(0, len(jobs), workers):
+        group = jobs[start:start + workers]
+        pools = [ProcessPoolExecutor(max_workers=1) for job in group]
+        try:
+            futures = [pool.submit(_run_job, job) for pool, job in zip(pools, group)]
+            results.extend(_get_result(future, job) for future, job in zip(futures, group))
+        finally:
+            for pool in pools:
+                pool.shutdown()
+    return results
+
+
+def _get_result(future, job):
+    try:
+        return future.result()
+    except Exception as e:
+        # _run_job catches errors itself, so this is a crashed worker,
+        # or a result that could not be sent back.
+        return JobResult(job.get('xlsx_path'), None, None, _get_error_message(e))
+
+
+def _run_job(job):
+    job = dict(job)
+    start = perf_counter()
+    try:
+        if 'schema_path' in job:
+            job['table_schema'] = load_schema(job.pop('schema_path'))
+        value = create_xlsx(**job)
+        error = None
+    except Exception as e:
+        value = None
+        error = _get_error_message(e)
+    return JobResult(job.get('xlsx_path'), value, perf_counter() - start, error)
+
+
+def load_schema(schema_path):
+    '''
+    Reads a JSON or YAML Table Schema, with relative "enumFile" paths
+    resolved against its directory.
+    '''
+    # JSON is also YAML, so this handles both.
+    from yaml import safe_load
+    with open(schema_path) as schema_file:
+        table_schema = safe_load(schema_file.read())
+    return resolve_enum_files(table_schema, os.path.dirname(os.path.abspath(schema_path)))
+
+
+def _get_error_message(e):
+    '''
+    >>> _get_error_message(Ts2xlException('Not a valid Table Schema: ...'))
+    'Not a valid Table Schema: ...'
+    >>> _get_error_message(KeyError('fields'))
+    "KeyError: 'fields'"
+    '''
+    if isinstance(e, Ts2xlException):
+        return str(e)
+    return f'{type(e).__name__}: {e}'
@@ -1,40 +1,149 @@
+import os
+import re
 from datetime import datetime
+from io import BytesIO
+from time import perf_counter
 
-from xlsxwriter import Workbook
-from xlsxwriter.utility import xl_col_to_name
-
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.timings import phase
 from tableschema_to_template.validation_factory import get_validation
 from tableschema_to_template.validate_schema import validate_schema
 
 
-def _col_below_header(i):
-    col_name = xl_col_to_name(i)
-    row_max = 1048576
-    return f'{col_name}2:{col_name}{row_max}'
+# Excel's limit, less the header row:
+# https://support.microsoft.com/en-us/office/excel-specifications-and-limits-1672b34d-7043-467e-8e27-269d656771c3
+_max_data_rows = 1048575
+
+
+def _get_position(output):
+    '''
+    Returns the position in a file object, or None for unseekable streams.
+    '''
+    try:
+        return output.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+def _cols_below_header(cols, max_rows):
+    '''
+    Given ascending column indexes, returns ranges below the header,
+    with neighboring columns combined.
+
+    >>> _cols_below_header([0], 1048575)
+    ['A2:A1048576']
+    >>> _cols_below_header([1, 2, 3, 5, 27], 1000)
+    ['B2:D1001', 'F2:F1001', 'AB2:AB1001']
+    '''
+    from xlsxwriter.utility import xl_col_to_name
+    row_max = max_rows + 1
+    runs = []
+    for col in cols:
+        if runs and runs[-1][1] == col - 1:
+            runs[-1][1] = col
+        else:
+            runs.append([col, col])
+    return [
+        f'{xl_col_to_name(first)}2:{xl_col_to_name(last)}{row_max}'
+        for first, last in runs
+    ]
+
+
+def _supports_multi_range():
+    '''
+    Older xlsxwriter drops a data_validation() with multi_range, with just a warning.
+    '''
+    from xlsxwriter import __version__
+    return tuple(int(part) for part in re.findall(r'\d+', __version__)[:3]) >= (3, 0, 4)
 
 
 def create_xlsx(
     table_schema, xlsx_path,
     sheet_name='Export this as TSV',
-    idempotent=False
+    idempotent=False,
+    max_rows=None,
+    cache_validation=True,
+    timings=None,
+    low_memory=False
 ):
     '''
     Creates Excel file with data validation from a Table Schema.
+    Instead of a path, xlsx_path may be a writable binary file object,
+    or None, to get the bytes of the Excel file back.
 
     Args:
         table_schema: Table Schema as dict.
         xlsx_path: Path of Excel file to create. Must end with ".xlsx".
         sheet_name: Optionally, specify the name of the data-entry sheet.
         idempotent: If set, internal date-stamp is set to 2000-01-01, so re-runs are identical.
+        max_rows: Optionally, limit data validation to this many rows below the header.
+        cache_validation: If unset, validation does not check or update the cache of outcomes.
+        timings: Optionally, a Timings object, to record how long each phase takes.
+        low_memory: If set, use temp files and unshared strings, to save memory on wide schemas.
 
     Returns:
-        No return value.
+        Bytes of the Excel file if xlsx_path is None; Otherwise, no return value.
 
     Raises:
-        tableschema_to_template.errors.Ts2xlException if table_schema is invalid.
+        tableschema_to_template.errors.Ts2xlException if table_schema or max_rows is invalid.
     '''
-    validate_schema(table_schema)
-    workbook = Workbook(xlsx_path)
+    with phase(timings, 'validate_schema'):
+        validate_schema(table_schema, use_cache=cache_validation)
+    if max_rows is None:
+        max_rows = _max_data_rows
+    if not 1 <= max_rows <= _max_data_rows:
+        raise Ts2xlException(f'max_rows must be between 1 and {_max_data_rows}')
+    output = BytesIO() if xlsx_path is None else xlsx_path
+    # Lists from files may be long: Write each row to a temp file as it is done,
+    # instead of holding every cell until the end.
+    constant_memory = low_memory or any(
+        'enumFile' in field.get('constraints', {})
+        for field in table_schema['fields']
+    )
+    start_bytes = _get_position(output) if timings is not None else None
+    if hasattr(output, 'write') and constant_memory:
+        # xlsxwriter ignores constant_memory when building in memory,
+        # so build in a temp file, and copy it to the file object.
+        # Imported here, so importing the package stays cheap.
+        from shutil import copyfileobj
+        from tempfile import mkstemp
+        fd, build_path = mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            _write_workbook(
+                table_schema, build_path, sheet_name, idempotent, max_rows,
+                constant_memory, timings)
+            with open(build_path, 'rb') as build_file:
+                copyfileobj(build_file, output)
+        finally:
+            os.remove(build_path)
+    else:
+        _write_workbook(
+            table_schema, output, sheet_name, idempotent, max_rows,
+            constant_memory, timings)
+
+    if timings is not None:
+        if hasattr(output, 'write'):
+            end_bytes = _get_position(output)
+            if start_bytes is not None and end_bytes is not None:
+                timings.output_bytes = end_bytes - start_bytes
+        else:
+            timings.output_bytes = os.path.getsize(output)
+    if xlsx_path is None:
+        return output.getvalue()
+
+
+def _write_workbook(
+    table_schema, output, sheet_name, idempotent, max_rows,
+    constant_memory, timings
+):
+    # Imported here, rather than at the top, so importing the package stays cheap.
+    from xlsxwriter import Workbook
+    workbook = Workbook(output, {
+        # For file objects, build in memory, instead of in temp files.
+        'in_memory': hasattr(output, 'write'),
+        'constant_memory': constant_memory
+    })
     if idempotent:
         workbook.set_properties({
             'created': datetime(2000, 1, 1)
@@ -48,10 +157,37 @@ def create_xlsx(
         'align': 'center'
     })
 
-    for i, field in enumerate(table_schema['fields']):
-        main_sheet.write(0, i, field['name'], header_format)
-        main_sheet.write_comment(0, i, field['description'])
-        data_validation = get_validation(field, workbook).get_data_validation()
-        main_sheet.data_validation(_col_below_header(i), data_validation)
+    # Fields with identical validations share a single rule,
+    # in order of first appearance, so output is stable.
+    cols_by_validation = {}
+    enum_sheets = {}
+    with phase(timings, 'fields'):
+        for i, field in enumerate(table_schema['fields']):
+            start = perf_counter()
+            main_sheet.write(0, i, field['name'], header_format)
+            written = perf_counter()
+            main_sheet.write_comment(0, i, field['description'])
+            commented = perf_counter()
+            data_validation = get_validation(field, workbook, enum_sheets).get_data_validation()
+            if timings is not None:
+                timings.add_field(
+                    field['name'],
+                    write=written - start,
+                    write_comment=commented - written,
+                    get_validation=perf_counter() - commented
+                )
+            key = repr(sorted(data_validation.items()))
+            cols_by_validation.setdefault(key, (data_validation, []))[1].append(i)
+
+    with phase(timings, 'data_validation'):
+        for data_validation, cols in cols_by_validation.values():
+            ranges = _cols_below_header(cols, max_rows)
+            if len(ranges) > 1 and _supports_multi_range():
+                main_sheet.data_validation(
+                    ranges[0], {**data_validation, 'multi_range': ' '.join(ranges)})
+                continue
+            for cell_range in ranges:
+                main_sheet.data_validation(cell_range, data_validation)
 
-    workbook.close()
+    with phase(timings, 'close'):
+        workbook.close()
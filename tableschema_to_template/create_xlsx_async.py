@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from weakref import WeakKeyDictionary
+
+from tableschema_to_template.create_xlsx import create_xlsx
+
+
+class AsyncCreator():
+    '''
+    Creates templates from coroutines without blocking the event loop:
+    Work runs in executor, with at most max_concurrency builds at a time.
+    The executor may be a ThreadPoolExecutor (the default) or a ProcessPoolExecutor.
+    '''
+    def __init__(self, max_concurrency=4, executor=None):
+        self.max_concurrency = max_concurrency
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_concurrency)
+        # Semaphores belong to an event loop, so there is one for each.
+        self._semaphores = WeakKeyDictionary()
+
+    async def create_xlsx(self, table_schema, xlsx_path=None, **kwargs):
+        '''
+        Takes the same arguments as create_xlsx(), and returns the same value.
+        If cancelled, builds that have not started are dropped, and
+        builds that have started run to the end, but nothing is written.
+        '''
+        loop = asyncio.get_event_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._semaphores[loop]
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(partial(create_xlsx, table_schema, None, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        # A started build can't be interrupted, so its slot is only released
+        # when it really ends, even if the caller has stopped waiting.
+        future.add_done_callback(lambda future: _release_soon(loop, semaphore))
+        xlsx_bytes = await asyncio.wrap_future(future)
+
+        if xlsx_path is None:
+            return xlsx_bytes
+        if hasattr(xlsx_path, 'write'):
+            xlsx_path.write(xlsx_bytes)
+        else:
+            await loop.run_in_executor(None, _write_bytes, xlsx_path, xlsx_bytes)
+        return None
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def _release_soon(loop, semaphore):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # The loop is closed, so nothing is waiting.
+        pass
+
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+_default_creator = None
+
+
+async def create_xlsx_async(table_schema, xlsx_path=None, **kwargs):
+    '''
+    Takes the same arguments as create_xlsx(), and returns the same value,
+    using a shared AsyncCreator with the default limits.
+    For other limits, or a process pool, make an AsyncCreator.
+    '''
+    global _default_creator
+    if _default_creator is None:
+        _default_creator = AsyncCreator()
+    return await _default_creator.create_xlsx(table_schema, xlsx_path, **kwargs)
@@ -0,0 +1,128 @@
+'''
+Listens on a Unix socket and creates templates on request,
+so that "ts2xl.py --socket" doesn't pay for imports and setup on every run:
+
+    python -m tableschema_to_template.daemon /tmp/ts2xl.sock
+
+Each request is one line of JSON, with the text of the schema, an absolute
+output path, and create_xlsx() options; Each response is one line of JSON.
+'''
+
+import argparse
+import os
+import signal
+import socket
+import sys
+from json import dumps, loads
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+
+from tableschema_to_template.create_xlsx import create_xlsx
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.validation_factory import resolve_enum_files
+from tableschema_to_template.validate_schema import get_validator
+
+
+class _Handler(StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = loads(line)
+            _create(**request)
+            response = {'error': None}
+        except Ts2xlException as e:
+            response = {'error': str(e), 'expected': True}
+        except Exception as e:
+            response = {'error': f'{type(e).__name__}: {e}', 'expected': False}
+        self.wfile.write(dumps(response).encode('utf-8') + b'\n')
+
+
+def _create(schema_text, xlsx_path, base_dir, options):
+    from yaml import safe_load
+    table_schema = safe_load(schema_text)
+    # The daemon's working directory is not the client's.
+    create_xlsx(resolve_enum_files(table_schema, base_dir), xlsx_path, **options)
+
+
+def make_server(socket_path):
+    '''
+    Returns a server listening on socket_path, after warming up imports and the validator.
+    A leftover socket file is removed, unless another daemon is listening on it.
+    '''
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise Ts2xlException(f'A daemon is already listening on "{socket_path}"')
+        os.remove(socket_path)
+    get_validator()
+    import xlsxwriter  # noqa: F401
+    import yaml  # noqa: F401
+    return ThreadingUnixStreamServer(socket_path, _Handler)
+
+
+def _is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def send_request(socket_path, schema_text, xlsx_path, options, base_dir=None):
+    '''
+    Asks the daemon on socket_path to create a template.
+    Relative "enumFile" paths are resolved against base_dir, by default the working directory.
+    Returns False if no daemon is listening, so the caller can create it instead.
+    '''
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            # No socket, a stale file, a socket we may not use, or a refused connection.
+            return False
+        try:
+            with sock.makefile('rwb') as stream:
+                stream.write(dumps({
+                    'schema_text': schema_text,
+                    'xlsx_path': os.path.abspath(xlsx_path),
+                    'base_dir': os.path.abspath(base_dir or os.getcwd()),
+                    'options': options
+                }).encode('utf-8') + b'\n')
+                stream.flush()
+                line = stream.readline()
+        except ConnectionError:
+            line = b''
+    if not line:
+        # Daemon went away before answering.
+        return False
+    response = loads(line)
+    if response['error'] is None:
+        return True
+    if response['expected']:
+        raise Ts2xlException(response['error'])
+    raise RuntimeError(f'Daemon failed: {response["error"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('socket_path', metavar='SOCKET', help='Path of Unix socket to listen on.')
+    args = parser.parse_args()
+    server = make_server(args.socket_path)
+    # Clean up on "kill", as well as on Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket_path)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Ts2xlException as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
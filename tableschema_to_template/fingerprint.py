@@ -0,0 +1,30 @@
+from hashlib import sha256
+from json import dumps
+
+
+def get_fingerprint(table_schema):
+    '''
+    Returns a hash of the Table Schema (or any JSON-compatible value)
+    which does not depend on key order or on how numbers were written:
+    Floats are serialized by their shortest round-trip representation.
+
+    >>> get_fingerprint({'b': [1, 2], 'a': 2.50}) == get_fingerprint({'a': 25e-1, 'b': [1, 2]})
+    True
+    >>> get_fingerprint({'a': [1, 2]}) == get_fingerprint({'a': [2, 1]})
+    False
+
+    Integers and integral floats are kept distinct: The draft-04 meta-schema
+    does not accept 1.0 where it requires an integer, and messages show "1.0".
+
+    >>> get_fingerprint({'a': 1}) == get_fingerprint({'a': 1.0})
+    False
+
+    Values which are not JSON, like dates from YAML, or NaN, raise
+    TypeError or ValueError, rather than risking collisions.
+    '''
+    canonical = dumps(
+        table_schema,
+        sort_keys=True, separators=(',', ':'),
+        ensure_ascii=False, allow_nan=False
+    )
+    return sha256(canonical.encode('utf-8')).hexdigest()
@@ -0,0 +1,188 @@
+'''
+Serves templates over HTTP: POST a JSON or YAML Table Schema, and get back an Excel file.
+
+    python -m tableschema_to_template.http_server --port 8000
+    curl --data-binary @schema.yaml 'localhost:8000/?sheet_name=Data' > template.xlsx
+
+Query parameters "sheet_name" and "max_rows" are passed to create_xlsx().
+Templates are built with idempotent=True, so the ETag identifies the content,
+and recent templates are kept in memory.
+'''
+
+import argparse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import BoundedSemaphore
+from urllib.parse import parse_qs, urlparse
+
+from tableschema_to_template.create_xlsx import create_xlsx
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.fingerprint import get_fingerprint
+from tableschema_to_template.lru import LruCache
+from tableschema_to_template.validate_schema import get_validator
+from tableschema_to_template.version import get_version
+
+
+xlsx_content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class TemplateHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, server_address,
+        cache_size=100, max_builds=4, build_timeout=30, max_body_bytes=2**20
+    ):
+        super().__init__(server_address, _Handler)
+        # Maps ETags to the bytes of recently created templates.
+        self.cache = LruCache(maxsize=cache_size)
+        # Requests beyond max_builds wait for a slot, for up to build_timeout seconds.
+        self.build_slots = BoundedSemaphore(max_builds)
+        self.build_timeout = build_timeout
+        self.max_body_bytes = max_body_bytes
+        # Output can change between releases, so ETags do too.
+        from xlsxwriter import __version__ as xlsxwriter_version
+        self.versions = {'version': get_version(), 'xlsxwriter_version': xlsxwriter_version}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            return self._send_error(411, 'Content-Length is required')
+        if length < 0:
+            # rfile.read(-1) would read until the client closes the connection.
+            return self._send_error(400, 'Content-Length must not be negative')
+        if length > self.server.max_body_bytes:
+            return self._send_error(413, f'Schema is over {self.server.max_body_bytes} bytes')
+        body = self.rfile.read(length)
+
+        try:
+            table_schema, options = _parse_request(body, urlparse(self.path).query)
+        except Ts2xlException as e:
+            return self._send_error(400, str(e))
+
+        etag = _get_etag(table_schema, options, self.server.versions)
+        if etag is not None and etag in _parse_etags(self.headers.get('If-None-Match', '')):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        xlsx_bytes = None if etag is None else self.server.cache.get(etag)
+        if xlsx_bytes is None:
+            if not self.server.build_slots.acquire(timeout=self.server.build_timeout):
+                return self._send_error(503, 'Too many requests: Try again later')
+            try:
+                xlsx_bytes = create_xlsx(table_schema, None, idempotent=True, **options)
+            except Ts2xlException as e:
+                return self._send_error(400, str(e))
+            except Exception as e:
+                # A bug, not a bad request: Still, the client should get a status.
+                return self._send_error(500, f'{type(e).__name__}: {e}')
+            finally:
+                self.server.build_slots.release()
+            if etag is not None:
+                self.server.cache.put(etag, xlsx_bytes)
+
+        self.send_response(200)
+        self.send_header('Content-Type', xlsx_content_type)
+        self.send_header('Content-Length', str(len(xlsx_bytes)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(xlsx_bytes)
+
+    def _send_error(self, status, message):
+        body = f'{message}\n'.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _parse_request(body, query):
+    '''
+    >>> _parse_request(b'fields: []', 'sheet_name=Data&max_rows=10')
+    ({'fields': []}, {'sheet_name': 'Data', 'max_rows': 10})
+    >>> _parse_request(b'fields: []', 'max_rows=ten')
+    Traceback (most recent call last):
+    ...
+    tableschema_to_template.errors.Ts2xlException: max_rows must be an integer
+    '''
+    from yaml import safe_load, YAMLError
+    try:
+        table_schema = safe_load(body.decode('utf-8'))
+    except (UnicodeDecodeError, YAMLError) as e:
+        raise Ts2xlException(f'Not JSON or YAML: {e}')
+
+    # Reading files named by the client would expose the server's filesystem.
+    if isinstance(table_schema, dict) and isinstance(table_schema.get('fields'), list):
+        for field in table_schema['fields']:
+            constraints = field.get('constraints') if isinstance(field, dict) else None
+            if isinstance(constraints, dict) and 'enumFile' in constraints:
+                raise Ts2xlException('enumFile is not supported over HTTP')
+
+    params = parse_qs(query)
+    options = {}
+    if 'sheet_name' in params:
+        options['sheet_name'] = params['sheet_name'][0]
+    if 'max_rows' in params:
+        try:
+            options['max_rows'] = int(params['max_rows'][0])
+        except ValueError:
+            raise Ts2xlException('max_rows must be an integer')
+    return table_schema, options
+
+
+def _get_etag(table_schema, options, versions):
+    try:
+        fingerprint = get_fingerprint(
+            {'table_schema': table_schema, 'options': options, **versions})
+        return f'"{fingerprint}"'
+    except (TypeError, ValueError):
+        # Not plain JSON: Build it, but don't cache it.
+        return None
+
+
+def _parse_etags(if_none_match):
+    '''
+    >>> _parse_etags('"a", W/"b"')
+    ['"a"', '"b"']
+    '''
+    return [
+        etag.strip()[2:] if etag.strip().startswith('W/') else etag.strip()
+        for etag in if_none_match.split(',')
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--cache_size', type=int, default=100,
+        help='Number of recent templates to keep in memory.')
+    parser.add_argument(
+        '--max_builds', type=int, default=4,
+        help='Number of templates to build at once; Other requests wait.')
+    args = parser.parse_args()
+
+    get_validator()
+    server = TemplateHTTPServer(
+        (args.host, args.port),
+        cache_size=args.cache_size, max_builds=args.max_builds
+    )
+    print(f'Listening on http://{args.host}:{server.server_address[1]}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
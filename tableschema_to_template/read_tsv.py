@@ -0,0 +1,112 @@
+'''
+Reads only the columns that are needed from a TSV, a block of rows at a time.
+The file is memory-mapped, and each block is decoded in one step, and split,
+instead of going line by line through the csv module:
+Cells after the last requested column are never split out.
+Blocks with quotes, or with old Mac line endings, are read with the csv module instead,
+from there to the end.
+'''
+
+import csv
+import mmap
+import os
+from io import BytesIO, TextIOWrapper
+from itertools import islice
+from operator import itemgetter
+
+
+_block_bytes = 2**16
+# For the csv module, the number of rows in a block.
+_block_rows = 10000
+
+
+def read_tsv_header(tsv_path):
+    '''
+    Returns the cells of the first line, and the byte offset of the line after it.
+    '''
+    with open(tsv_path, 'rb') as tsv_file:
+        line = tsv_file.readline()
+    # Excel may add a byte order mark.
+    text = line.decode('utf-8-sig').rstrip('\r\n')
+    return next(csv.reader([text], delimiter='\t'), []), len(line)
+
+
+def read_tsv_columns(tsv_path, indexes, start=0, end=None):
+    '''
+    Yields (row_count, columns) for each block of rows between the byte offsets
+    start and end, which should be at the starts of lines. columns has a list of str
+    for each of the indexes, with '' for missing cells. Blank lines are rows.
+
+    >>> from tempfile import NamedTemporaryFile
+    >>> with NamedTemporaryFile(suffix='.tsv') as tsv_file:
+    ...     _ = tsv_file.write('a\\tb\\tc\\n1\\t2\\t3\\n\\n4\\t5\\r\\n'.encode('utf-8'))
+    ...     tsv_file.flush()
+    ...     list(read_tsv_columns(tsv_file.name, [0, 2], start=6))
+    [(3, [['1', '', '4'], ['3', '', '']])]
+    '''
+    with open(tsv_path, 'rb') as tsv_file:
+        size = os.fstat(tsv_file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(tsv_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            while start < end:
+                block_end = _get_block_end(data, start, end)
+                block = data[start:block_end]
+                if b'\r' in block:
+                    block = block.replace(b'\r\n', b'\n')
+                if b'"' in block or b'\r' in block:
+                    # A quoted value may span lines, and blocks.
+                    yield from _read_csv_columns(tsv_file, indexes, start, end, size)
+                    return
+                yield _split_block(block, indexes)
+                start = block_end
+
+
+def _get_block_end(data, start, end):
+    block_end = start + _block_bytes
+    if block_end >= end:
+        return end
+    newline = data.rfind(b'\n', start, block_end)
+    if newline == -1:
+        # The line is longer than a block.
+        newline = data.find(b'\n', block_end, end)
+        if newline == -1:
+            return end
+    return newline + 1
+
+
+def _split_block(block, indexes):
+    # Decoding the whole block is quicker than decoding the requested cells one by one.
+    lines = block.decode('utf-8').split('\n')
+    if not lines[-1]:
+        # The block ends with a newline.
+        lines.pop()
+    if not indexes:
+        return len(lines), []
+    # Cells after the last requested column are left in one piece.
+    maxsplit = max(indexes) + 1
+    rows = [line.split('\t', maxsplit) for line in lines]
+    return len(lines), _get_columns(rows, indexes)
+
+
+def _read_csv_columns(tsv_file, indexes, start, end, size):
+    tsv_file.seek(start)
+    raw_file = tsv_file if end == size else BytesIO(tsv_file.read(end - start))
+    rows = csv.reader(TextIOWrapper(raw_file, encoding='utf-8', newline=''), delimiter='\t')
+    while True:
+        block = list(islice(rows, _block_rows))
+        if not block:
+            return
+        yield len(block), _get_columns(block, indexes)
+
+
+def _get_columns(rows, indexes):
+    columns = []
+    for i in indexes:
+        try:
+            columns.append(list(map(itemgetter(i), rows)))
+        except IndexError:
+            # Some rows are short.
+            columns.append([cells[i] if i < len(cells) else '' for cells in rows])
+    return columns
@@ -0,0 +1,346 @@
+'''
+Reads the cell values of an Excel sheet one row at a time,
+so that long sheets don't need to fit in memory.
+Formulas give their last computed values, and styles are ignored,
+except to find dates, which are otherwise just numbers.
+'''
+
+import posixpath
+import re
+from array import array
+from datetime import datetime, timedelta
+from xml.etree.ElementTree import iterparse, parse
+from xml.parsers.expat import ParserCreate
+from zipfile import ZipFile
+
+from tableschema_to_template.errors import Ts2xlException
+
+
+_main_ns = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_rel_ns = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_package_rel_ns = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_chunk_size = 2**16
+
+# Built-in number formats, which are not listed in styles.xml.
+_builtin_date_formats = {
+    **{i: 'date' for i in range(14, 18)},
+    **{i: 'time' for i in range(18, 22)},
+    22: 'datetime',
+    45: 'time', 47: 'time'
+}
+
+
+def read_xlsx(xlsx_path, sheet_name=None, dates=False):
+    '''
+    Yields (row_number, values) for each row that has cells, with rows numbered from 1,
+    as in Excel. Values are in column order, with None for missing cells;
+    Each is a str, int, float, or bool. Reads the first sheet, unless sheet_name is given.
+    With dates=True, numbers formatted as dates or times are instead
+    a datetime.date, datetime.time, or datetime.datetime.
+    '''
+    with ZipFile(xlsx_path) as zip_file:
+        sheet_path = _get_sheet_path(zip_file, sheet_name)
+        shared_strings = _read_shared_strings(zip_file)
+        date_styles = _read_date_styles(zip_file) if dates else {}
+        epoch = _get_epoch(zip_file) if date_styles else None
+        with zip_file.open(sheet_path) as sheet_file:
+            yield from _SheetReader(shared_strings, date_styles, epoch).read(sheet_file)
+
+
+def _get_sheet_path(zip_file, sheet_name):
+    with zip_file.open('xl/workbook.xml') as workbook_file:
+        sheets = [
+            (element.get('name'), element.get(f'{_rel_ns}id'))
+            for event, element in iterparse(workbook_file)
+            if element.tag == f'{_main_ns}sheet'
+        ]
+    with zip_file.open('xl/_rels/workbook.xml.rels') as rels_file:
+        targets = {
+            element.get('Id'): element.get('Target')
+            for event, element in iterparse(rels_file)
+            if element.tag == f'{_package_rel_ns}Relationship'
+        }
+    for name, rel_id in sheets:
+        if sheet_name is None or name == sheet_name:
+            target = targets[rel_id]
+            # Targets are usually relative to "xl/", but may be absolute.
+            if target.startswith('/'):
+                return target[1:]
+            return posixpath.normpath(posixpath.join('xl', target))
+    raise Ts2xlException(f'No sheet named "{sheet_name}"')
+
+
+def _read_date_styles(zip_file):
+    '''
+    Returns a dict from the style indexes of cells, as str, to the kind of date they show.
+    '''
+    if 'xl/styles.xml' not in zip_file.namelist():
+        return {}
+    with zip_file.open('xl/styles.xml') as styles_file:
+        root = parse(styles_file).getroot()
+    kinds = dict(_builtin_date_formats)
+    for num_fmt in root.iter(f'{_main_ns}numFmt'):
+        kinds[int(num_fmt.get('numFmtId'))] = _get_date_kind(num_fmt.get('formatCode', ''))
+    cell_xfs = root.find(f'{_main_ns}cellXfs')
+    if cell_xfs is None:
+        return {}
+    return {
+        str(i): kinds[int(xf.get('numFmtId', 0))]
+        for i, xf in enumerate(cell_xfs.iter(f'{_main_ns}xf'))
+        if kinds.get(int(xf.get('numFmtId', 0)))
+    }
+
+
+def _get_date_kind(format_code):
+    '''
+    Returns "date", "time", or "datetime", if the format shows one, and otherwise None.
+    Durations, like "[h]:mm", are left as numbers.
+
+    >>> [_get_date_kind(code) for code in ['yyyy-mm-dd', 'mmm', 'h:mm AM/PM', 'd/m/yy h:mm']]
+    ['date', 'date', 'time', 'datetime']
+    >>> [_get_date_kind(code) for code in ['General', '0.00', '"days" 0', '[Red]0', '[h]:mm']]
+    [None, None, None, None, None]
+    '''
+    code = format_code.lower()
+    if re.search(r'\[(h|m|s)+\]', code):
+        return None
+    # Quoted text, escaped characters, and colors or conditions in brackets are not dates.
+    code = re.sub(r'"[^"]*"|\\.|_.|\*.|\[[^\]]*\]', '', code).split(';')[0]
+    has_time = re.search('[hs]', code) is not None
+    # "m" is minutes next to hours or seconds, and otherwise months.
+    has_date = re.search('[dy]', code) is not None or ('m' in code and not has_time)
+    if has_date and has_time:
+        return 'datetime'
+    return 'date' if has_date else 'time' if has_time else None
+
+
+def _get_epoch(zip_file):
+    with zip_file.open('xl/workbook.xml') as workbook_file:
+        for event, element in iterparse(workbook_file):
+            if element.tag == f'{_main_ns}workbookPr':
+                if element.get('date1904') in ['1', 'true']:
+                    return datetime(1904, 1, 1)
+    return datetime(1899, 12, 30)
+
+
+def _to_date(number, kind, epoch):
+    '''
+    >>> epoch = datetime(1899, 12, 30)
+    >>> _to_date(44197.75, 'datetime', epoch)
+    datetime.datetime(2021, 1, 1, 18, 0)
+    >>> _to_date(44197.75, 'date', epoch), _to_date(0.75, 'time', epoch)
+    (datetime.date(2021, 1, 1), datetime.time(18, 0))
+    >>> _to_date(59, 'date', epoch)
+    datetime.date(1900, 2, 28)
+    '''
+    if epoch.year == 1899 and number < 60:
+        # Excel counts February 29, 1900, which never happened.
+        number += 1
+    try:
+        value = epoch + timedelta(milliseconds=round(number * 86400000))
+    except OverflowError:
+        return number
+    if kind == 'date':
+        return value.date()
+    if kind == 'time':
+        return value.time()
+    return value
+
+
+class SharedStrings():
+    '''
+    Strings in one UTF-8 buffer, with an array of offsets:
+    Much smaller than a list, when a sheet has millions of distinct strings.
+
+    >>> shared_strings = SharedStrings()
+    >>> for s in ['abc', '', 'é']:
+    ...     shared_strings.append(s)
+    >>> [shared_strings[i] for i in range(len(shared_strings))]
+    ['abc', '', 'é']
+    '''
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, s):
+        self.data += s.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def _read_shared_strings(zip_file):
+    shared_strings = SharedStrings()
+    if 'xl/sharedStrings.xml' in zip_file.namelist():
+        with zip_file.open('xl/sharedStrings.xml') as strings_file:
+            for s in _StringsReader().read(strings_file):
+                shared_strings.append(s)
+    return shared_strings
+
+
+class _Reader():
+    '''
+    Base for streaming readers, which take expat callbacks, and collect results in
+    self.results, which are yielded after each chunk, so memory use stays flat.
+    Tags are compared without namespaces: Some files use a prefix, like "x:c".
+    '''
+    def read(self, xml_file):
+        parser = ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_root
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.characters
+        self.parser = parser
+        self.results = []
+        self.text = None
+        while True:
+            chunk = xml_file.read(_chunk_size)
+            parser.Parse(chunk, not chunk)
+            yield from self.results
+            self.results.clear()
+            if not chunk:
+                return
+
+    def _start_root(self, name, attrs):
+        # The root element tells us the prefix, if any.
+        prefix = name[:name.index(':') + 1] if ':' in name else ''
+        self.set_tags(prefix)
+        self.parser.StartElementHandler = self.start
+
+    def characters(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+
+class _StringsReader(_Reader):
+    '''
+    Plain text is in <si><t>, and rich text is in runs, <si><r><t>.
+    Phonetic hints, <rPh><t>, are not part of the value.
+    '''
+    def set_tags(self, prefix):
+        self.si_tag = f'{prefix}si'
+        self.t_tag = f'{prefix}t'
+        self.rph_tag = f'{prefix}rPh'
+        self.parts = None
+
+    def start(self, name, attrs):
+        if name == self.si_tag:
+            self.parts = []
+        elif name == self.t_tag and self.parts is not None:
+            self.text = self.parts
+        elif name == self.rph_tag:
+            self.parts, self.saved_parts = None, self.parts
+
+    def end(self, name):
+        if name == self.t_tag:
+            self.text = None
+        elif name == self.rph_tag:
+            self.parts = self.saved_parts
+        elif name == self.si_tag:
+            self.results.append(''.join(self.parts))
+            self.parts = None
+
+
+def _get_col(letters):
+    '''
+    >>> [_get_col(letters) for letters in ['A', 'Z', 'AA', 'XFD']]
+    [0, 25, 26, 16383]
+    '''
+    col = 0
+    for letter in letters:
+        col = col * 26 + ord(letter) - 64
+    return col - 1
+
+
+def _to_number(text):
+    '''
+    >>> [_to_number(text) for text in ['5', '-2', '2.5', '1E-3']]
+    [5, -2, 2.5, 0.001]
+    '''
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class _SheetReader(_Reader):
+    '''
+    Cells are <c r="B2" t="s" s="1"><v>0</v></c>, where "t" is the type, and "s" the style:
+    The value is in <v>, or for inline strings, in <is><t>, like shared strings.
+    '''
+    def __init__(self, shared_strings, date_styles=None, epoch=None):
+        self.shared_strings = shared_strings
+        self.date_styles = date_styles or {}
+        self.epoch = epoch
+        self.row_number = 0
+        # Maps column letters to indexes; There are at most 16384.
+        self.cols = {}
+
+    def set_tags(self, prefix):
+        self.row_tag = f'{prefix}row'
+        self.c_tag = f'{prefix}c'
+        self.v_tag = f'{prefix}v'
+        self.t_tag = f'{prefix}t'
+        self.rph_tag = f'{prefix}rPh'
+        self.values = None
+        self.parts = None
+        self.in_phonetic = False
+
+    def start(self, name, attrs):
+        if name == self.c_tag:
+            cell_ref = attrs.get('r')
+            if cell_ref:
+                letters = cell_ref.rstrip('0123456789')
+                col = self.cols.get(letters)
+                if col is None:
+                    col = self.cols[letters] = _get_col(letters)
+            else:
+                col = len(self.values)
+            if col > len(self.values):
+                self.values.extend([None] * (col - len(self.values)))
+            self.cell_type = attrs.get('t', 'n')
+            self.date_kind = self.date_styles.get(attrs.get('s')) if self.date_styles else None
+            self.parts = None
+        elif name == self.v_tag or (name == self.t_tag and not self.in_phonetic):
+            if self.parts is None:
+                self.parts = []
+            self.text = self.parts
+        elif name == self.row_tag:
+            self.row_number = int(attrs.get('r', self.row_number + 1))
+            self.values = []
+        elif name == self.rph_tag:
+            self.in_phonetic = True
+
+    def end(self, name):
+        if name == self.c_tag:
+            self.values.append(self._get_value())
+        elif name == self.v_tag or name == self.t_tag:
+            self.text = None
+        elif name == self.row_tag:
+            if self.values:
+                self.results.append((self.row_number, self.values))
+        elif name == self.rph_tag:
+            self.in_phonetic = False
+
+    def _get_value(self):
+        if self.parts is None:
+            return None
+        text = ''.join(self.parts)
+        cell_type = self.cell_type
+        if cell_type == 's':
+            return self.shared_strings[int(text)]
+        if cell_type == 'n':
+            if not text:
+                return None
+            if self.date_kind:
+                return _to_date(_to_number(text), self.date_kind, self.epoch)
+            return _to_number(text)
+        if cell_type == 'b':
+            return text == '1'
+        # Inline strings, 'inlineStr'; Formula strings, 'str'; and errors, 'e', like "#N/A".
+        return text
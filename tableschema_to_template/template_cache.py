@@ -0,0 +1,173 @@
+import os
+from shutil import copyfileobj
+from tempfile import mkstemp
+from threading import Lock
+
+from tableschema_to_template.create_xlsx import create_xlsx
+from tableschema_to_template.fingerprint import get_fingerprint
+from tableschema_to_template.lru import CacheInfo
+from tableschema_to_template.validate_schema import validate_schema
+from tableschema_to_template.version import get_version
+
+
+class TemplateCache():
+    '''
+    Keeps Excel files in cache_dir, named by a hash of everything that determines
+    their contents, so a repeated request is a copy instead of a rebuild.
+    Only idempotent=True requests are cached: Otherwise, the date-stamp changes.
+    When the files add up to more than max_bytes, the least recently used are removed.
+    Other processes may share the same cache_dir.
+    '''
+    def __init__(self, cache_dir, max_bytes=2**30, hardlink=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Hardlinks are cheaper, but changes to the output would also change the cache.
+        self.hardlink = hardlink
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def create_xlsx(self, table_schema, xlsx_path, **kwargs):
+        '''
+        Takes the same arguments as create_xlsx(), and returns the same value.
+        '''
+        # Invalid schemas fail here, as they would in create_xlsx().
+        validate_schema(table_schema, use_cache=kwargs.get('cache_validation', True))
+        key = get_template_key(table_schema, kwargs) if kwargs.get('idempotent') else None
+        if key is None:
+            return create_xlsx(table_schema, xlsx_path, **kwargs)
+
+        cached_path = os.path.join(self.cache_dir, f'{key}.xlsx')
+        try:
+            # Once open, it can be read even if another process evicts it.
+            cached_file = open(cached_path, 'rb')
+        except FileNotFoundError:
+            cached_file = None
+        if cached_file is not None:
+            self._count(hit=True)
+            with cached_file:
+                try:
+                    # Touch, so the least recently used are evicted first.
+                    os.utime(cached_path)
+                except FileNotFoundError:
+                    pass
+                return self._copy(cached_file, cached_path, xlsx_path)
+
+        self._count(hit=False)
+        # Build under a temporary name, and rename when complete,
+        # so other processes never see a partial file.
+        fd, tmp_path = mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            create_xlsx(table_schema, tmp_path, **kwargs)
+            with open(tmp_path, 'rb') as tmp_file:
+                value = self._copy(tmp_file, tmp_path, xlsx_path)
+            os.replace(tmp_path, cached_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._evict()
+        return value
+
+    def info(self):
+        '''
+        Returns CacheInfo(hits, misses, maxsize, currsize), with sizes in bytes.
+        Hits and misses are for this process; Size is for the whole directory.
+        '''
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        current_bytes = sum(size for path, size, mtime in self._get_entries())
+        return CacheInfo(hits, misses, self.max_bytes, current_bytes)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _copy(self, cached_file, cached_path, xlsx_path):
+        if xlsx_path is None:
+            return cached_file.read()
+        if hasattr(xlsx_path, 'write'):
+            copyfileobj(cached_file, xlsx_path)
+            return None
+        if self.hardlink:
+            try:
+                if os.path.lexists(xlsx_path):
+                    os.remove(xlsx_path)
+                os.link(cached_path, xlsx_path)
+                return None
+            except OSError:
+                # Perhaps a different filesystem: Copy instead.
+                pass
+        with open(xlsx_path, 'wb') as xlsx_file:
+            copyfileobj(cached_file, xlsx_file)
+        return None
+
+    def _get_entries(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.xlsx'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Evicted by another process.
+                continue
+            entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._get_entries(), key=lambda entry: entry[2])
+        total_bytes = sum(size for path, size, mtime in entries)
+        for path, size, mtime in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+def get_template_key(table_schema, kwargs):
+    '''
+    Returns a hash of everything that determines the contents of the Excel file,
+    or None if the schema can't be fingerprinted.
+    '''
+    from xlsxwriter import __version__ as xlsxwriter_version
+    options = {
+        k: v for k, v in kwargs.items()
+        if k not in ['cache_validation', 'timings']
+    }
+    try:
+        return get_fingerprint({
+            'table_schema': table_schema,
+            'options': options,
+            'enum_files': _get_enum_file_stats(table_schema),
+            'version': get_version(),
+            'xlsxwriter_version': xlsxwriter_version
+        })
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_enum_file_stats(table_schema):
+    '''
+    Files named by "enumFile" are part of the output,
+    so their size and modification time are part of the key.
+    '''
+    stats = []
+    for field in table_schema['fields']:
+        enum_file = field.get('constraints', {}).get('enumFile')
+        if enum_file is None:
+            continue
+        try:
+            stat = os.stat(enum_file)
+            stats.append([os.path.abspath(enum_file), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            # create_xlsx() will report the problem.
+            stats.append([enum_file, None, None])
+    return stats
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class Timings():
+    '''
+    Pass to create_xlsx() to record how long each phase takes,
+    and how long each field takes to write, comment, and validate.
+    If given, callback is called with the name and seconds of each phase as it ends.
+
+    >>> timings = Timings()
+    >>> with phase(timings, 'example'):
+    ...     pass
+    >>> list(timings.to_dict()['phases'])
+    ['example']
+    '''
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.phases = {}
+        self.fields = []
+        self.output_bytes = None
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0) + seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def add_field(self, name, write, write_comment, get_validation):
+        self.fields.append({
+            'name': name,
+            'write': write,
+            'write_comment': write_comment,
+            'get_validation': get_validation
+        })
+
+    def to_dict(self):
+        return {
+            'phases': dict(self.phases),
+            'fields': list(self.fields),
+            'output_bytes': self.output_bytes
+        }
+
+
+@contextmanager
+def phase(timings, name):
+    '''
+    Times the block, if timings is not None.
+    '''
+    start = perf_counter()
+    yield
+    if timings is not None:
+        timings.add_phase(name, perf_counter() - start)
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
 import sys
 import os
 import re
-
-from yaml import safe_load
+from glob import glob
+from time import perf_counter
 
 from tableschema_to_template.errors import Ts2xlException
-from tableschema_to_template import create_xlsx
+from tableschema_to_template.timings import Timings, phase
+from tableschema_to_template import create_xlsx, create_many
 
 
 def _xlsx_path(s):
+    if s == '-':
+        return s
     if os.path.exists(s):
         raise Ts2xlException(f'"{s}" already exists')
     if not s.endswith('.xlsx'):
@@ -19,6 +23,85 @@ def _xlsx_path(s):
     return s
 
 
+def _schema_text(s):
+    if s == '-':
+        return sys.stdin.read()
+    try:
+        with open(s) as schema_file:
+            return schema_file.read()
+    except OSError as e:
+        raise Ts2xlException(f"can't open '{s}': {e.strerror}")
+
+
+def _schema_paths(s):
+    '''
+    Given a directory, returns the JSON and YAML files it contains;
+    Otherwise, treats the argument as a glob.
+    '''
+    if os.path.isdir(s):
+        paths = [
+            path for path in glob(os.path.join(s, '*'))
+            if path.endswith(('.json', '.yaml', '.yml'))
+        ]
+    else:
+        paths = glob(s)
+    if not paths:
+        raise Ts2xlException(f'No schemas found in "{s}"')
+    return sorted(paths)
+
+
+def _batch_jobs(schema_paths, xlsx_dir, create_args):
+    '''
+    Returns jobs for create_many(), the keys to record for them,
+    and the number of templates that are up to date.
+    A template is up to date if the key recorded next to it, when it was created,
+    still matches: The key covers the schema, the options, the enumFiles, and the versions.
+    '''
+    from tableschema_to_template.create_many import load_schema
+    from tableschema_to_template.template_cache import get_template_key
+    jobs = []
+    keys = {}
+    up_to_date = 0
+    xlsx_paths = set()
+    for schema_path in schema_paths:
+        stem = os.path.splitext(os.path.basename(schema_path))[0]
+        xlsx_path = os.path.join(xlsx_dir, f'{stem}.xlsx')
+        if xlsx_path in xlsx_paths:
+            raise Ts2xlException(f'More than one schema would create "{xlsx_path}"')
+        xlsx_paths.add(xlsx_path)
+        try:
+            table_schema = load_schema(schema_path)
+        except Exception:
+            # The job will report the problem.
+            jobs.append({'schema_path': schema_path, 'xlsx_path': xlsx_path, **create_args})
+            continue
+        key = get_template_key(table_schema, create_args)
+        if key is not None and os.path.exists(xlsx_path) and _read_key(xlsx_path) == key:
+            up_to_date += 1
+            continue
+        jobs.append({'table_schema': table_schema, 'xlsx_path': xlsx_path, **create_args})
+        keys[xlsx_path] = key
+    return jobs, keys, up_to_date
+
+
+def _read_key(xlsx_path):
+    try:
+        with open(f'{xlsx_path}.key') as key_file:
+            return key_file.read().strip()
+    except OSError:
+        return None
+
+
+def _write_key(xlsx_path, key):
+    key_path = f'{xlsx_path}.key'
+    if key is None:
+        if os.path.exists(key_path):
+            os.remove(key_path)
+        return
+    with open(key_path, 'w') as key_file:
+        key_file.write(f'{key}\n')
+
+
 def _make_parser():
     parser = argparse.ArgumentParser(
         description='''
@@ -27,13 +110,13 @@ generates an Excel template with input validation.
 ''')
     doc_dict = _doc_to_dict(create_xlsx.__doc__)
     parser.add_argument(
-        'schema_path', type=argparse.FileType('r'),
+        'schema_path',
         metavar='SCHEMA',
         help='Path of JSON or YAML Table Schema.')
     parser.add_argument(
-        'xlsx_path', type=_xlsx_path,
+        'xlsx_path',
         metavar='EXCEL',
-        help=doc_dict['xlsx_path'])
+        help=f'{doc_dict["xlsx_path"]} Use "-" for stdout.')
     parser.add_argument(
         '--sheet_name',
         metavar='NAME',
@@ -42,6 +125,44 @@ generates an Excel template with input validation.
         '--idempotent',
         action='store_true',
         help=doc_dict['idempotent'])
+    parser.add_argument(
+        '--max_rows', type=int,
+        metavar='N',
+        help=doc_dict['max_rows'])
+    parser.add_argument(
+        '--low_memory',
+        action='store_true',
+        help=doc_dict['low_memory'])
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='SCHEMA is instead a directory or glob of schemas, '
+        'and EXCEL is a directory for the templates. '
+        'A template is skipped if it was created from the same schema, options, '
+        'enumFiles, and version, as recorded in a ".key" file next to it.')
+    parser.add_argument(
+        '--jobs', type=int,
+        metavar='N',
+        help='With --batch, the number of templates to create in parallel. '
+        'Defaults to the number of CPUs.')
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='If a daemon is listening on this Unix socket, '
+        'it creates the template; Otherwise, this process does. '
+        'Start the daemon with: python -m tableschema_to_template.daemon PATH')
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Print how long each phase took, as JSON, to stdout, '
+        'or to stderr if EXCEL is "-". The daemon is not used.')
+    parser.add_argument(
+        '--profile',
+        metavar='OUT',
+        help='Write cProfile stats to OUT, for use with pstats or snakeviz, '
+        'and the largest allocations to OUT.allocations.txt. '
+        'The daemon is not used, and with --batch, '
+        'work in other processes is only seen with --jobs 1.')
     return parser
 
 
@@ -72,15 +193,137 @@ _parser = _make_parser()
 
 def main():
     args = vars(_parser.parse_args())
+    profile_path = args.pop('profile')
+    if profile_path:
+        return _profile(
+            lambda on_phase: _main(args, use_daemon=False, on_phase=on_phase), profile_path)
+    return _main(args)
+
+
+def _main(args, use_daemon=True, on_phase=None):
+    '''
+    on_phase, if given, is called with the name and seconds of each phase as it ends.
+    '''
     schema_path = args.pop('schema_path')
-    table_schema = safe_load(schema_path.read())
     xlsx_path = args.pop('xlsx_path')
-    create_xlsx(table_schema, xlsx_path, **args)
+    batch = args.pop('batch')
+    jobs = args.pop('jobs')
+    socket_path = args.pop('socket')
+    print_timings = args.pop('timings')
+    timings = Timings(on_phase) if print_timings or on_phase else None
+    if batch:
+        if print_timings:
+            raise Ts2xlException('--timings can not be used with --batch')
+        return _main_batch(schema_path, xlsx_path, jobs, args)
+
+    schema_text = _schema_text(schema_path)
+    # Relative "enumFile" paths are relative to the schema.
+    base_dir = os.getcwd() if schema_path == '-' else os.path.dirname(os.path.abspath(schema_path))
+    xlsx_path = _xlsx_path(xlsx_path)
+    if socket_path and xlsx_path != '-' and not print_timings and use_daemon:
+        from tableschema_to_template.daemon import send_request
+        if send_request(socket_path, schema_text, xlsx_path, args, base_dir):
+            print(f'Created {xlsx_path}', file=sys.stderr)
+            return 0
 
-    print(f'Created {xlsx_path}', file=sys.stderr)
+    with phase(timings, 'load_schema'):
+        # Imported here, so the daemon client doesn't pay for it.
+        from yaml import safe_load
+        from tableschema_to_template.validation_factory import resolve_enum_files
+        table_schema = resolve_enum_files(safe_load(schema_text), base_dir)
+    if xlsx_path == '-':
+        sys.stdout.buffer.write(create_xlsx(table_schema, None, timings=timings, **args))
+        print('Created Excel file on stdout', file=sys.stderr)
+    else:
+        create_xlsx(table_schema, xlsx_path, timings=timings, **args)
+        print(f'Created {xlsx_path}', file=sys.stderr)
+
+    if print_timings:
+        print(
+            json.dumps(timings.to_dict(), indent=2),
+            file=sys.stderr if xlsx_path == '-' else sys.stdout)
     return 0
 
 
+def _profile(run, profile_path, top_n=25):
+    '''
+    Calls run(on_phase) under cProfile and tracemalloc, and writes reports
+    to profile_path and profile_path + ".allocations.txt".
+    '''
+    import cProfile
+    import tracemalloc
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        # Field timings are only kept because of the profile.
+        tracemalloc.Filter(False, sys.modules[Timings.__module__].__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')
+    ]
+    snapshots = {}
+
+    def on_phase(name, seconds):
+        # Compare memory after validation with memory just before the workbook is
+        # written out, and freed: The difference is what building it took.
+        if name in ['validate_schema', 'data_validation']:
+            # Snapshots are slow: Keep them out of the cProfile stats.
+            profiler.disable()
+            try:
+                snapshots[name] = tracemalloc.take_snapshot().filter_traces(filters)
+            finally:
+                profiler.enable()
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        return profiler.runcall(run, on_phase)
+    finally:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if len(snapshots) == 2:
+            stats = snapshots['data_validation'].compare_to(
+                snapshots['validate_schema'], 'lineno')
+            heading = 'memory allocated while building the workbook, before it was closed'
+        else:
+            # With --batch, templates are not built in phases in this process.
+            stats = tracemalloc.take_snapshot().filter_traces(filters).statistics('lineno')
+            heading = 'memory still allocated at exit'
+        tracemalloc.stop()
+        profiler.dump_stats(profile_path)
+        allocations_path = f'{profile_path}.allocations.txt'
+        lines = [
+            f'Peak traced memory: {peak_bytes / 2**20:.1f} MiB',
+            f'Still allocated at exit: {current_bytes / 2**20:.1f} MiB',
+            f'Top {top_n} lines by {heading}:'
+        ] + [str(stat) for stat in stats[:top_n]]
+        with open(allocations_path, 'w') as allocations_file:
+            allocations_file.write('\n'.join(lines) + '\n')
+        print(f'Wrote {profile_path} and {allocations_path}', file=sys.stderr)
+
+
+def _main_batch(schema_glob, xlsx_dir, workers, create_args):
+    schema_paths = _schema_paths(schema_glob)
+    os.makedirs(xlsx_dir, exist_ok=True)
+    jobs, keys, up_to_date = _batch_jobs(schema_paths, xlsx_dir, create_args)
+
+    start = perf_counter()
+    results = create_many(jobs, workers=workers)
+    seconds = perf_counter() - start
+
+    failed = 0
+    for result in results:
+        if result.error is not None:
+            failed += 1
+            print(f'Failed {result.xlsx_path}: {result.error}', file=sys.stderr)
+        else:
+            _write_key(result.xlsx_path, keys.get(result.xlsx_path))
+    created = len(results) - failed
+    rate = len(results) / seconds if results else 0
+    print(
+        f'Created {created}, failed {failed}, skipped {up_to_date} up to date; '
+        f'{seconds:.2f}s, {rate:.1f} schemas/s',
+        file=sys.stderr)
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     try:
         exit_status = main()
@@ -0,0 +1,108 @@
+'''
+Checks a batch of values from one column at a time, instead of one value at a time.
+Number and boolean columns of text, as from TSV, are checked with NumPy, if it is installed;
+Otherwise, or for other columns, with plain Python. The results are the same either way.
+'''
+
+from tableschema_to_template.validation_factory import (
+    BooleanValidation, IntegerValidation, NumberValidation, _to_number
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Integers above this may not survive conversion to float, so they are checked one by one.
+_max_exact_float = 2**53
+
+
+def get_column_errors(validation, values):
+    '''
+    Returns (index, error) for each non-blank value in the sequence
+    that fails validation, in order.
+
+    >>> from tableschema_to_template.validation_factory import get_validation
+    >>> validation = get_validation({'name': 'n', 'type': 'integer'}, None)
+    >>> errors = get_column_errors(validation, ['1', '', 'x', None, '2.5'])
+    >>> [i for i, error in errors]
+    [2, 4]
+    >>> errors[0][1]
+    'The values in this column must be integers.'
+    '''
+    if not values:
+        return []
+    if numpy is not None and set(map(type, values)) == {str}:
+        if isinstance(validation, NumberValidation):
+            candidates = _get_number_candidates(validation, values)
+        elif isinstance(validation, BooleanValidation):
+            candidates = _get_boolean_candidates(values)
+        else:
+            candidates = None
+        if candidates is not None:
+            # Candidates include everything that might fail, and few that don't.
+            return _get_errors(validation, values, candidates)
+    if isinstance(validation, NumberValidation):
+        return _get_number_errors(validation, values)
+    return _get_errors(validation, values, range(len(values)))
+
+
+def _get_errors(validation, values, indexes):
+    errors = []
+    for i in indexes:
+        value = values[i]
+        if value is None or value == '':
+            continue
+        error = validation.get_error(value)
+        if error is not None:
+            errors.append((i, error))
+    return errors
+
+
+def _get_number_errors(validation, values):
+    '''
+    Like get_error() for each value, but the bounds and message are only looked up once.
+    '''
+    minimum = validation.get_min()
+    maximum = validation.get_max()
+    message = validation.get_data_validation()['error_message']
+    errors = []
+    for i, value in enumerate(values):
+        if value is None or value == '':
+            continue
+        number = _to_number(value)
+        if number is None or not minimum <= number <= maximum or not validation.is_allowed(number):
+            errors.append((i, message))
+    return errors
+
+
+def _get_number_candidates(validation, values):
+    '''
+    Returns indexes of values that might not be valid numbers,
+    or None if they can't be converted as a batch.
+    '''
+    texts = numpy.array(values)
+    present = numpy.flatnonzero(texts != '')
+    try:
+        numbers = texts[present].astype(numpy.float64)
+    except ValueError:
+        # At least one is not a number.
+        return None
+    with numpy.errstate(invalid='ignore'):
+        ok = (
+            numpy.isfinite(numbers)
+            & (numpy.abs(numbers) < _max_exact_float)
+            & (numbers >= validation.get_min())
+            & (numbers <= validation.get_max())
+        )
+        if isinstance(validation, IntegerValidation):
+            ok &= numbers == numpy.floor(numbers)
+    return present[~ok].tolist()
+
+
+def _get_boolean_candidates(values):
+    texts = numpy.array(values)
+    ok = numpy.isin(texts, ['', 'TRUE', 'FALSE', 'true', 'false', 'True', 'False'])
+    # Others, like "tRuE", are valid, but rare: get_error() decides.
+    return numpy.flatnonzero(~ok).tolist()
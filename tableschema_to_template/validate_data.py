@@ -0,0 +1,261 @@
+'''
+Checks a filled-in template, TSV or Excel, against its Table Schema,
+and prints a line of JSON for each problem:
+
+    python -m tableschema_to_template.validate_data schema.yaml data.tsv
+
+Rows are numbered as in Excel, with the header as row 1; Blank cells are not checked.
+The exit status is 1 if there are problems.
+'''
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, zip_longest
+from operator import itemgetter
+from uuid import uuid4
+from zipfile import BadZipFile
+
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.read_tsv import read_tsv_columns, read_tsv_header
+from tableschema_to_template.read_xlsx import read_xlsx
+from tableschema_to_template.validate_columns import get_column_errors
+from tableschema_to_template.validate_schema import validate_schema
+from tableschema_to_template.validation_factory import (
+    BaseValidation, get_enum_sheet_names, get_validation, resolve_enum_files
+)
+
+
+_batch_size = 10000
+# With workers, each process reads this much of a TSV at a time.
+_chunk_bytes = 2**24
+
+
+def validate_data(table_schema, data_path, sheet_name=None, workers=1):
+    '''
+    Yields a dict for each problem in the TSV or Excel file at data_path,
+    with the row and column where it was found, the value, and an error message.
+    Rows are read in batches, so long files use little memory.
+    For Excel, the first sheet is read, unless sheet_name is given.
+    If workers is more than 1, a TSV is split into chunks of lines, which are checked
+    in a pool of processes; The problems are the same, and in the same order,
+    but values may not contain line breaks, even in quotes.
+    '''
+    validate_schema(table_schema)
+    is_xlsx = data_path.lower().endswith('.xlsx')
+    try:
+        if is_xlsx:
+            rows = read_xlsx(data_path, sheet_name)
+            header_row_number, header = next(rows, (1, []))
+        else:
+            header_row_number = 1
+            header, start = read_tsv_header(data_path)
+    except (OSError, BadZipFile) as e:
+        raise Ts2xlException(f'Could not read data: {e}')
+    except UnicodeDecodeError as e:
+        raise _get_decode_error(e)
+    header = ['' if name is None else str(name) for name in header]
+
+    problems, checks = _get_checks(table_schema, header_row_number, header)
+    yield from problems
+    if is_xlsx:
+        yield from _check_rows(rows, checks)
+    elif workers > 1:
+        yield from _check_tsv_in_pool(table_schema, data_path, header, start, workers)
+    else:
+        blocks = read_tsv_columns(data_path, [i for i, name, validation in checks], start)
+        yield from _check_blocks(_decoded(blocks), checks, header_row_number + 1)
+
+
+def _decoded(blocks):
+    try:
+        yield from blocks
+    except UnicodeDecodeError as e:
+        raise _get_decode_error(e)
+
+
+def _get_decode_error(e):
+    # Excel's "Text (Tab delimited)" is not UTF-8, for one.
+    return Ts2xlException(f'Could not read data: {e.reason}: The TSV is not UTF-8')
+
+
+def _get_checks(table_schema, header_row_number, header):
+    '''
+    Returns problems with the header, and (index, name, validation) for each column to check.
+    '''
+    problems = []
+    fields_by_name = {field['name']: field for field in table_schema['fields']}
+    for name in fields_by_name:
+        if name not in header:
+            problems.append(_get_problem(header_row_number, name, None, 'Column is missing'))
+    checks = []
+    enum_sheets = get_enum_sheet_names(table_schema['fields'])
+    for i, name in enumerate(header):
+        if name not in fields_by_name:
+            if name:
+                problems.append(
+                    _get_problem(header_row_number, name, name, 'Column is not in the schema'))
+            continue
+        validation = get_validation(fields_by_name[name], None, enum_sheets)
+        # Any value is allowed, so there is nothing to check.
+        if type(validation) is not BaseValidation:
+            checks.append((i, name, validation))
+    return problems, checks
+
+
+def _check_rows(rows, checks):
+    while True:
+        batch = list(islice(rows, _batch_size))
+        if not batch:
+            return
+        all_columns = list(zip_longest(*map(itemgetter(1), batch), fillvalue=''))
+        columns = [
+            all_columns[i] if i < len(all_columns) else ()
+            for i, name, validation in checks
+        ]
+        yield from _check_columns(list(map(itemgetter(0), batch)), columns, checks)
+
+
+def _check_blocks(blocks, checks, row_number):
+    for row_count, columns in blocks:
+        yield from _check_columns(range(row_number, row_number + row_count), columns, checks)
+        row_number += row_count
+
+
+def _check_columns(row_numbers, columns, checks):
+    # Columns are checked a batch of rows at a time, which is quicker than cell by cell,
+    # but problems are yielded in the same order: By row, then column.
+    errors = []
+    for check_index, column in enumerate(columns):
+        validation = checks[check_index][2]
+        for row_index, error in get_column_errors(validation, column):
+            errors.append((row_index, check_index, error))
+    for row_index, check_index, error in sorted(errors):
+        name = checks[check_index][1]
+        value = columns[check_index][row_index]
+        yield _get_problem(row_numbers[row_index], name, value, error)
+
+
+def _check_tsv_in_pool(table_schema, data_path, header, start, workers):
+    '''
+    Yields problems from each chunk in file order, renumbering rows as it goes.
+    Only a few chunks are in flight at once, so a long file doesn't fill memory with results.
+    '''
+    # Identifies this call to workers, which build its checks once, and reuse them.
+    run_id = uuid4().hex
+    rows_before = 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = deque()
+        try:
+            for chunk_start, chunk_end in _get_chunks(data_path, start, _chunk_bytes):
+                futures.append(pool.submit(
+                    _check_chunk, run_id, table_schema, header,
+                    data_path, chunk_start, chunk_end))
+                while len(futures) > workers * 2 or futures and futures[0].done():
+                    row_count, problems = futures.popleft().result()
+                    yield from _renumber(problems, rows_before)
+                    rows_before += row_count
+            while futures:
+                row_count, problems = futures.popleft().result()
+                yield from _renumber(problems, rows_before)
+                rows_before += row_count
+        finally:
+            # If the caller stops early, don't wait for chunks it won't read.
+            for future in futures:
+                future.cancel()
+
+
+def _get_chunks(data_path, start, chunk_bytes):
+    '''
+    Yields (start, end) byte offsets of chunks of about chunk_bytes, which end after a newline.
+    '''
+    with open(data_path, 'rb') as data_file:
+        size = os.fstat(data_file.fileno()).st_size
+        while start < size:
+            data_file.seek(start + chunk_bytes - 1)
+            data_file.readline()
+            end = min(data_file.tell(), size)
+            yield start, end
+            start = end
+
+
+def _renumber(problems, rows_before):
+    for problem in problems:
+        problem['row'] += rows_before
+        yield problem
+
+
+# Checks for the current run, in a worker process.
+_worker_checks = {}
+
+
+def _check_chunk(run_id, table_schema, header, data_path, start, end):
+    '''
+    Runs in a worker: Returns the number of rows in the chunk,
+    and its problems, with rows numbered from 1.
+    '''
+    checks = _worker_checks.get(run_id)
+    if checks is None:
+        _worker_checks.clear()
+        checks = _worker_checks[run_id] = _get_checks(table_schema, 1, header)[1]
+    row_count = 0
+    problems = []
+    indexes = [i for i, name, validation in checks]
+    blocks = _decoded(read_tsv_columns(data_path, indexes, start, end))
+    for block_row_count, columns in blocks:
+        row_numbers = range(row_count + 1, row_count + block_row_count + 1)
+        problems.extend(_check_columns(row_numbers, columns, checks))
+        row_count += block_row_count
+    return row_count, problems
+
+
+def _get_problem(row, column, value, error):
+    return {'row': row, 'column': column, 'value': value, 'error': error}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('schema_path', metavar='SCHEMA', help='Path of JSON or YAML Table Schema.')
+    parser.add_argument('data_path', metavar='DATA', help='Path of TSV or Excel file to check.')
+    parser.add_argument(
+        '--sheet_name', metavar='NAME',
+        help='For Excel, the sheet to check; Defaults to the first.')
+    parser.add_argument(
+        '--max_errors', type=int, metavar='N',
+        help='Stop after N problems.')
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help='For TSV, the number of processes to check chunks of lines in parallel; '
+        'Values may not then contain line breaks. Defaults to 1.')
+    args = parser.parse_args()
+
+    from yaml import safe_load
+    try:
+        with open(args.schema_path) as schema_file:
+            table_schema = safe_load(schema_file)
+    except OSError as e:
+        raise Ts2xlException(f"can't open '{args.schema_path}': {e.strerror}")
+    # Relative "enumFile" paths are relative to the schema.
+    table_schema = resolve_enum_files(
+        table_schema, os.path.dirname(os.path.abspath(args.schema_path)))
+
+    count = 0
+    for problem in validate_data(table_schema, args.data_path, args.sheet_name, args.jobs):
+        print(json.dumps(problem))
+        count += 1
+        if count == args.max_errors:
+            break
+    return 1 if count else 0
+
+
+if __name__ == '__main__':
+    try:
+        exit_status = main()
+    except Ts2xlException as e:
+        print(e, file=sys.stderr)
+        exit_status = 2
+    sys.exit(exit_status)
@@ -1,11 +1,12 @@
-from yaml import safe_load
-from jsonschema import validate
-from jsonschema import ValidationError
+from json import loads
+from threading import Lock
 
 from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.fingerprint import get_fingerprint
+from tableschema_to_template.lru import LruCache
 
 
-def validate_schema(table_schema):
+def validate_schema(table_schema, use_cache=True):
     '''
     >>> validate_schema({})
     Traceback (most recent call last):
@@ -13,15 +14,142 @@ def validate_schema(table_schema):
     tableschema_to_template.errors.Ts2xlException: Not a valid Table Schema: 'fields' ... required property
 
     (Phrasing of error message changed between versions.)
+
+    Unless use_cache is False, outcomes are remembered by schema fingerprint:
+
+    >>> validation_cache.clear()
+    >>> validate_schema({'fields': [{'name': 'abc'}]})
+    >>> validate_schema({'fields': [{'name': 'abc'}]})
+    >>> validation_cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
     '''
-    table_schema_schema = safe_load(_table_schema_schema)
+    fingerprint = _get_fingerprint_or_none(table_schema) if use_cache else None
+    if fingerprint is None:
+        message = _get_error_message(table_schema)
+    else:
+        message = validation_cache.get(fingerprint, _missing)
+        if message is _missing:
+            message = _get_error_message(table_schema)
+            validation_cache.put(fingerprint, message)
+    if message is not None:
+        raise Ts2xlException(f'Not a valid Table Schema: {message}')
+
+
+# Maps schema fingerprints to None if valid, or to the error message.
+validation_cache = LruCache(maxsize=1024)
+_missing = object()
+
+
+def _get_fingerprint_or_none(table_schema):
     try:
-        validate(table_schema, table_schema_schema)
-    except ValidationError as e:
-        raise Ts2xlException(f'Not a valid Table Schema: {e.message}')
+        return get_fingerprint(table_schema)
+    except (TypeError, ValueError):
+        # Not plain JSON: Validate without the cache.
+        return None
+
+
+def _get_error_message(table_schema):
+    if _is_valid_by_type(table_schema):
+        return None
+    # Equivalent to jsonschema.validate(), but without rebuilding the validator.
+    error = _best_match(get_validator().iter_errors(table_schema))
+    return None if error is None else error.message
+
+
+def _best_match(errors):
+    try:
+        from jsonschema.exceptions import best_match
+    except ImportError:
+        # Before jsonschema 2.3, validate() just raised the first error.
+        return next(iter(errors), None)
+    return best_match(errors)
+
+
+_validator = None
+_type_validators = None
+_validator_lock = Lock()
+
+
+def get_validator():
+    '''
+    Returns the jsonschema validator for Table Schemas.
+    It is built on the first call and reused after that,
+    so long-running processes can call this at startup to warm it.
+
+    >>> get_validator() is get_validator()
+    True
+    >>> get_validator().is_valid({'fields': [{'name': 'abc'}]})
+    True
+    '''
+    global _validator
+    if _validator is None:
+        # Imported here, rather than at the top, so importing the package stays cheap.
+        from jsonschema import Draft4Validator
+        with _validator_lock:
+            if _validator is None:
+                table_schema_schema = loads(_table_schema_schema)
+                Draft4Validator.check_schema(table_schema_schema)
+                _validator = Draft4Validator(table_schema_schema)
+    return _validator
+
+
+def _get_type_validators():
+    '''
+    Splits the meta-schema into a validator for everything except the fields,
+    a validator for each field type, and a validator for fields in general.
+    '''
+    global _type_validators
+    if _type_validators is None:
+        from jsonschema import Draft4Validator
+        field_schema = get_validator().schema['properties']['fields']['items']
+        by_type = {
+            type_schema['properties']['type']['enum'][0]: Draft4Validator(type_schema)
+            for type_schema in field_schema['anyOf']
+        }
+        # Fresh copy, so the full validator is untouched:
+        top_schema = loads(_table_schema_schema)
+        del top_schema['properties']['fields']['items']
+        with _validator_lock:
+            _type_validators = (
+                Draft4Validator(top_schema), by_type, Draft4Validator(field_schema)
+            )
+    return _type_validators
+
+
+def _is_valid_by_type(table_schema):
+    '''
+    Checks each field only against the sub-schema for its type,
+    instead of trying every branch of the "anyOf" in the meta-schema.
+    Valid under one branch means valid under the "anyOf", so True can be trusted;
+    on False, the caller falls back to the full validator for the error message.
+
+    >>> _is_valid_by_type({'fields': [{'name': 'abc', 'type': 'integer'}]})
+    True
+    >>> _is_valid_by_type({'fields': [{'name': 'abc', 'type': 'not-a-type'}]})
+    False
+    >>> validate_schema({'fields': [{'name': 'abc', 'type': 'not-a-type'}]})
+    Traceback (most recent call last):
+    ...
+    tableschema_to_template.errors.Ts2xlException: Not a valid Table Schema: ... is not valid under any of the given schemas
+    '''
+    top_validator, by_type, field_validator = _get_type_validators()
+    if not top_validator.is_valid(table_schema):
+        return False
+    for field in table_schema['fields']:
+        field_type = field.get('type') if isinstance(field, dict) else None
+        # String and Number fields do not require "type":
+        # Without it, only the full "anyOf" will do.
+        validator = (
+            by_type.get(field_type, field_validator)
+            if isinstance(field_type, str) else field_validator
+        )
+        if not validator.is_valid(field):
+            return False
+    return True
 
 
 # This is ugly, but it's less configuration than including JSON in the build.
+# It is parsed with the json module: Much faster than PyYAML, on a cold start.
 # From: https://specs.frictionlessdata.io/schemas/table-schema.json
 _table_schema_schema = r'''
 {
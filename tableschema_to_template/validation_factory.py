@@ -1,6 +1,14 @@
-def get_validation(field, workbook):
+import math
+import os
+
+from tableschema_to_template.errors import Ts2xlException
+
+
+def get_validation(field, workbook, enum_sheets=None):
     if 'constraints' in field and 'enum' in field['constraints']:
-        return EnumValidation(field, workbook)
+        return EnumValidation(field, workbook, enum_sheets)
+    if 'constraints' in field and 'enumFile' in field['constraints']:
+        return EnumFileValidation(field, workbook, enum_sheets)
     if 'type' in field and field['type'] == 'number':
         return FloatValidation(field, workbook)
     if 'type' in field and field['type'] == 'integer':
@@ -10,7 +18,33 @@ def get_validation(field, workbook):
     return BaseValidation(field, workbook)
 
 
+def get_enum_sheet_names(fields):
+    '''
+    To check values, pass this as enum_sheets to get_validation(), with workbook None,
+    so that error messages name the list sheets the template has:
+    Fields with the same enum share one, named for the first of them.
+
+    >>> fields = [
+    ...     {'name': name, 'constraints': {'enum': list('ABCDEF')}}
+    ...     for name in ['first', 'second']
+    ... ]
+    >>> enum_sheets = get_enum_sheet_names(fields)
+    >>> get_validation(fields[1], None, enum_sheets).get_error('X')
+    'Value must come from first list.'
+    '''
+    enum_sheets = {}
+    for field in fields:
+        validation = get_validation(field, None)
+        if isinstance(validation, EnumValidation):
+            enum_sheets.setdefault(validation.get_enum_key(), _get_sheet_name(field['name']))
+    return enum_sheets
+
+
 class BaseValidation():
+    '''
+    To check values, rather than write a template, workbook may be None,
+    and get_error() is called for each non-blank value.
+    '''
     def __init__(self, field, workbook):
         self.field = field
         self.workbook = workbook
@@ -20,6 +54,41 @@ class BaseValidation():
             'validate': 'any'
         }
 
+    def get_error(self, value):
+        return None
+
+
+def _to_text(value):
+    '''
+    Values from TSV are strings, but values from Excel may also be numbers or booleans.
+
+    >>> [_to_text(value) for value in [True, 2, 2.0, 2.5, 'x']]
+    ['TRUE', '2', '2', '2.5', 'x']
+    '''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _to_number(value):
+    '''
+    Returns the value as a finite number, or None if it is not one.
+
+    >>> [_to_number(value) for value in [1, '2.5', ' 3 ', 'nan', 'x', True]]
+    [1, 2.5, 3.0, None, None, None]
+    '''
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
 
 def _get_sheet_name(field_name):
     '''
@@ -46,23 +115,138 @@ def _get_enum_error_message(enum, sheet_name):
     return f"Value must come from {sheet_name}."
 
 
+# Excel's row limit:
+# https://support.microsoft.com/en-us/office/excel-specifications-and-limits-1672b34d-7043-467e-8e27-269d656771c3
+_max_enum_length = 1048576
+
+
 class EnumValidation(BaseValidation):
-    def get_data_validation(self):
-        sheet_name = _get_sheet_name(self.field['name'])
-        enum_sheet = self.workbook.add_worksheet(sheet_name)
+    def __init__(self, field, workbook, enum_sheets=None):
+        super().__init__(field, workbook)
+        # Maps each enum to its list sheet, so fields with the same enum can share one sheet;
+        # To check values, from get_enum_sheet_names().
+        self.enum_sheets = {} if enum_sheets is None else enum_sheets
+        # For get_error(), the enum as a set, and the message, once read.
+        self.enum_values = None
+        self.error_message = None
 
-        enum = self.field['constraints']['enum']
-        for i, value in enumerate(enum):
-            enum_sheet.write(i, 0, value)
+    def get_enum_key(self):
+        # repr keeps 1, 1.0, and True apart.
+        return repr(self.field['constraints']['enum'])
+
+    def get_enum(self):
+        return self.field['constraints']['enum']
+
+    def get_data_validation(self):
+        enum_key = self.get_enum_key()
+        if enum_key not in self.enum_sheets:
+            self.enum_sheets[enum_key] = self.write_enum_sheet()
+        sheet_name, enum_length, error_message = self.enum_sheets[enum_key]
 
         return {
             'validate': 'list',
-            'source': f"='{sheet_name}'!$A$1:$A${len(enum)}",
+            'source': f"='{sheet_name}'!$A$1:$A${enum_length}",
             # NOTE: OpenOffice uses "." instead of "!".
             'error_title': 'Value must come from list',
-            'error_message': _get_enum_error_message(enum, sheet_name)
+            'error_message': error_message
         }
 
+    def write_enum_sheet(self):
+        sheet_name = _get_sheet_name(self.field['name'])
+        enum_sheet = self.workbook.add_worksheet(sheet_name)
+
+        # Values are written as they come, so long enums need not be held in memory:
+        # The message only lists the values if there are fewer than six.
+        first_values = []
+        enum_length = 0
+        for i, value in enumerate(self.get_enum()):
+            if i == _max_enum_length:
+                raise Ts2xlException(
+                    f'Enum for "{self.field["name"]}" has more than {_max_enum_length} values')
+            enum_sheet.write(i, 0, value)
+            if i < 6:
+                first_values.append(value)
+            enum_length = i + 1
+        if not enum_length:
+            raise Ts2xlException(f'Enum for "{self.field["name"]}" is empty')
+        # With constant_memory, each sheet keeps a temp file open until the workbook closes:
+        # Close it now, so schemas with many lists don't run out of file handles.
+        # xlsxwriter reopens it to assemble the file.
+        if self.workbook.constant_memory and hasattr(enum_sheet, '_opt_close'):
+            enum_sheet._opt_close()
+        return sheet_name, enum_length, _get_enum_error_message(first_values, sheet_name)
+
+    def get_error(self, value):
+        '''
+        >>> validation = EnumValidation({'name': 'n', 'constraints': {'enum': ['A', 1]}}, None)
+        >>> [validation.get_error(value) for value in ['A', '1', 1.0]]
+        [None, None, None]
+        >>> validation.get_error('B')
+        'Value must be one of: A / 1.'
+        '''
+        if self.enum_values is None:
+            first_values = []
+            self.enum_values = set()
+            for value_text in (_to_text(enum_value) for enum_value in self.get_enum()):
+                self.enum_values.add(value_text)
+                if len(first_values) < 6:
+                    first_values.append(value_text)
+            # Fields with the same enum share a list sheet, named for the first of them.
+            sheet_name = self.enum_sheets.get(
+                self.get_enum_key(), _get_sheet_name(self.field['name']))
+            self.error_message = _get_enum_error_message(first_values, sheet_name)
+        if _to_text(value) in self.enum_values:
+            return None
+        return self.error_message
+
+
+def resolve_enum_files(table_schema, base_dir):
+    '''
+    Relative paths in "enumFile" are relative to the schema file,
+    so callers that load a schema from a file pass its directory as base_dir.
+
+    >>> resolve_enum_files({'fields': [{'constraints': {'enumFile': 'a.txt'}}]}, '/tmp')
+    {'fields': [{'constraints': {'enumFile': '/tmp/a.txt'}}]}
+    '''
+    if not isinstance(table_schema, dict) or not isinstance(table_schema.get('fields'), list):
+        # Invalid, and validation will say so.
+        return table_schema
+    fields = []
+    for field in table_schema['fields']:
+        constraints = field.get('constraints') if isinstance(field, dict) else None
+        if isinstance(constraints, dict) and isinstance(constraints.get('enumFile'), str):
+            enum_file = os.path.join(base_dir, constraints['enumFile'])
+            field = {**field, 'constraints': {**constraints, 'enumFile': enum_file}}
+        fields.append(field)
+    return {**table_schema, 'fields': fields}
+
+
+def _read_enum_file(path):
+    '''
+    Yields the first column of each non-blank line of a plain text or TSV file.
+    '''
+    try:
+        enum_file = open(path, encoding='utf-8')
+    except OSError as e:
+        raise Ts2xlException(f'Could not read enumFile: {e}')
+    with enum_file:
+        for line in enum_file:
+            value = line.rstrip('\r\n').split('\t', 1)[0]
+            if value:
+                yield value
+
+
+class EnumFileValidation(EnumValidation):
+    '''
+    Like EnumValidation, but "enumFile" in the constraints gives the path
+    of a file with one value per line, which is read one line at a time.
+    '''
+    def get_enum_key(self):
+        return f"enumFile:{os.path.abspath(self.field['constraints']['enumFile'])}"
+
+    def get_enum(self):
+        return _read_enum_file(self.field['constraints']['enumFile'])
+
 
 class NumberValidation(BaseValidation):
     def get_bound(self, bound_name, default):
@@ -82,6 +266,19 @@ class NumberValidation(BaseValidation):
             return f" <= {cons['maximum']}"
         return ''
 
+    def get_error(self, value):
+        number = _to_number(value)
+        if (
+            number is None
+            or not self.is_allowed(number)
+            or not self.get_min() <= number <= self.get_max()
+        ):
+            return self.get_data_validation()['error_message']
+        return None
+
+    def is_allowed(self, number):
+        return True
+
 
 class FloatValidation(NumberValidation):
     def get_data_validation(self):
@@ -115,6 +312,18 @@ class IntegerValidation(NumberValidation):
             'maximum': self.get_max()
         }
 
+    def is_allowed(self, number):
+        '''
+        >>> validation = IntegerValidation({'name': 'n', 'constraints': {'minimum': 1}}, None)
+        >>> [validation.get_error(value) for value in ['1', 2.0, '3.0']]
+        [None, None, None]
+        >>> validation.get_error('1.5')
+        'The values in this column must be integers >= 1.'
+        >>> validation.get_error('0')
+        'The values in this column must be integers >= 1.'
+        '''
+        return isinstance(number, int) or number.is_integer()
+
     def get_min(self):
         return self.get_bound('minimum', -2147483647)
 
@@ -130,3 +339,15 @@ class BooleanValidation(BaseValidation):
             'error_title': 'Not a boolean',
             'error_message': 'The values in this column must be "TRUE" or "FALSE".'
         }
+
+    def get_error(self, value):
+        '''
+        >>> validation = BooleanValidation({'name': 'n'}, None)
+        >>> [validation.get_error(value) for value in ['TRUE', 'false', False]]
+        [None, None, None]
+        >>> validation.get_error('yes')
+        'The values in this column must be "TRUE" or "FALSE".'
+        '''
+        if _to_text(value).upper() in ['TRUE', 'FALSE']:
+            return None
+        return self.get_data_validation()['error_message']
@@ -0,0 +1,48 @@
+import os
+from functools import lru_cache
+from hashlib import sha256
+
+
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def get_version():
+    '''
+    Identifies the code that builds templates, for cache keys and ETags:
+    The release, from the installed distribution or from VERSION in a checkout,
+    and a hash of the package's sources, so edits to a checkout change it too.
+
+    >>> get_version() == get_version()
+    True
+    >>> '+' in get_version()
+    True
+    '''
+    return f'{_get_release()}+{_get_sources_hash()}'
+
+
+def _get_release():
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # Python 3.7 or earlier.
+        version = None
+    if version is not None:
+        try:
+            return version('tableschema-to-template')
+        except PackageNotFoundError:
+            pass
+    try:
+        with open(os.path.join(os.path.dirname(_package_dir), 'VERSION')) as version_file:
+            return version_file.read().strip()
+    except OSError:
+        return 'unknown'
+
+
+def _get_sources_hash():
+    sources = sha256()
+    for name in sorted(os.listdir(_package_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(_package_dir, name), 'rb') as source_file:
+                sources.update(name.encode('utf-8') + b'\0' + source_file.read() + b'\0')
+    return sources.hexdigest()[:16]
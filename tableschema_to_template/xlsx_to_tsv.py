@@ -0,0 +1,83 @@
+'''
+Writes the data-entry sheet of a filled-in template as TSV,
+for when it comes back as Excel, instead of exported:
+
+    python -m tableschema_to_template.xlsx_to_tsv data.xlsx data.tsv
+
+Rows are read one at a time, so long sheets use little memory.
+Cells formatted as dates or times are written as ISO 8601, like "2021-01-31 18:00:00":
+Other numbers are written in full, not as formatted in Excel.
+'''
+
+import argparse
+import csv
+import sys
+from datetime import date, datetime, time
+
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.read_xlsx import read_xlsx
+
+
+def xlsx_to_tsv(xlsx_path, tsv_file, sheet_name=None):
+    '''
+    Writes the first sheet, or sheet_name, to the text file object tsv_file.
+    Rows without cells are written as blank lines, so line numbers match row numbers.
+    Booleans are written as TRUE and FALSE, dates and times as ISO 8601,
+    and other numbers in full, not as formatted in Excel.
+    '''
+    writer = csv.writer(tsv_file, delimiter='\t', lineterminator='\n')
+    next_row_number = 1
+    for row_number, values in read_xlsx(xlsx_path, sheet_name, dates=True):
+        writer.writerows([] for _ in range(row_number - next_row_number))
+        writer.writerow([_format_value(value) for value in values])
+        next_row_number = row_number + 1
+
+
+def _format_value(value):
+    '''
+    >>> [_format_value(value) for value in [None, True, 2.0, 2.5, 'x']]
+    ['', 'TRUE', '2', '2.5', 'x']
+    >>> values = [datetime(2021, 1, 31, 18), date(2021, 1, 31), time(18)]
+    >>> [_format_value(value) for value in values]
+    ['2021-01-31 18:00:00', '2021-01-31', '18:00:00']
+    '''
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('xlsx_path', metavar='EXCEL', help='Path of Excel file to read.')
+    parser.add_argument(
+        'tsv_path', metavar='TSV', nargs='?', default='-',
+        help='Path of TSV file to write; Defaults to stdout.')
+    parser.add_argument(
+        '--sheet_name', metavar='NAME',
+        help='The sheet to write; Defaults to the first.')
+    args = parser.parse_args()
+
+    if args.tsv_path == '-':
+        xlsx_to_tsv(args.xlsx_path, sys.stdout, args.sheet_name)
+        return 0
+    with open(args.tsv_path, 'w', newline='', encoding='utf-8') as tsv_file:
+        xlsx_to_tsv(args.xlsx_path, tsv_file, args.sheet_name)
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        exit_status = main()
+    except Ts2xlException as e:
+        print(e, file=sys.stderr)
+        exit_status = 2
+    sys.exit(exit_status)
@@ -38,6 +38,95 @@ function test_good() {
   rm -rf $OLD_DIR
 }
 
+function test_stdout() {
+  NEW_DIR=`mktemp -d`
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    tests/fixtures/schema.yaml - > $NEW_DIR/template.xlsx
+  unzip -q -t $NEW_DIR/template.xlsx > /dev/null || die 'Output on stdout is not a valid zip'
+  rm -rf $NEW_DIR
+}
+
+function test_stdin() {
+  NEW_DIR=`mktemp -d`
+  cat tests/fixtures/schema.yaml | PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    - $NEW_DIR/template.xlsx
+  unzip -q -t $NEW_DIR/template.xlsx > /dev/null || die 'Schema on stdin did not give a valid zip'
+  rm -rf $NEW_DIR
+}
+
+function test_batch() {
+  SCHEMA_DIR=`mktemp -d`
+  NEW_DIR=`mktemp -d`
+  cp tests/fixtures/schema.yaml $SCHEMA_DIR/first.yaml
+  cp tests/fixtures/schema.yaml $SCHEMA_DIR/second.yaml
+  for EXPECTED in 'Created 2, failed 0, skipped 0' 'Created 0, failed 0, skipped 2'; do
+    PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+      tableschema_to_template/ts2xl.py \
+      $SCHEMA_DIR $NEW_DIR --batch --jobs 2 2>&1 \
+      | grep "$EXPECTED" || die "Did not see '$EXPECTED'"
+  done
+  # Different options make different templates.
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    $SCHEMA_DIR $NEW_DIR --batch --jobs 2 --max_rows 10 2>&1 \
+    | grep 'Created 2, failed 0, skipped 0' || die 'Did not rebuild with new options'
+  unzip -q -t $NEW_DIR/first.xlsx > /dev/null || die 'Batch output is not a valid zip'
+  unzip -q -t $NEW_DIR/second.xlsx > /dev/null || die 'Batch output is not a valid zip'
+  rm -rf $SCHEMA_DIR
+  rm -rf $NEW_DIR
+}
+
+function test_relative_enum_file() {
+  SCHEMA_DIR=`mktemp -d`
+  NEW_DIR=`mktemp -d`
+  printf 'heart\nlung\n' > $SCHEMA_DIR/organs.txt
+  echo '{"fields": [{"name": "organ", "description": "a", "constraints": {"enumFile": "organs.txt"}}]}' \
+    > $SCHEMA_DIR/schema.json
+  # Run from the repo, not the schema's directory.
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    $SCHEMA_DIR/schema.json $NEW_DIR/template.xlsx \
+    || die 'Relative enumFile was not found next to the schema'
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    $SCHEMA_DIR $NEW_DIR --batch 2>&1 \
+    | grep 'Created 1, failed 0' \
+    || die 'Relative enumFile was not found next to the schema with --batch'
+  # A changed enumFile makes a different template, even if the schema is older.
+  printf 'heart\nlung\nliver\n' > $SCHEMA_DIR/organs.txt
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    $SCHEMA_DIR $NEW_DIR --batch 2>&1 \
+    | grep 'Created 1, failed 0, skipped 0' \
+    || die 'Did not rebuild with a changed enumFile'
+  rm -rf $SCHEMA_DIR
+  rm -rf $NEW_DIR
+}
+
+function test_timings() {
+  NEW_DIR=`mktemp -d`
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    tests/fixtures/schema.yaml $NEW_DIR/template.xlsx --timings 2> /dev/null \
+    | python -c 'import json, sys; assert json.load(sys.stdin)["output_bytes"] > 0' \
+    || die 'Did not see timings'
+  rm -rf $NEW_DIR
+}
+
+function test_profile() {
+  NEW_DIR=`mktemp -d`
+  PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
+    tableschema_to_template/ts2xl.py \
+    tests/fixtures/schema.yaml $NEW_DIR/template.xlsx --profile $NEW_DIR/profile 2> /dev/null
+  python -c "import pstats; pstats.Stats('$NEW_DIR/profile')" || die 'Profile is not readable'
+  grep 'Peak traced memory' $NEW_DIR/profile.allocations.txt || die 'Did not see allocations'
+  grep 'while building the workbook' $NEW_DIR/profile.allocations.txt \
+    || die 'Did not see allocations before close'
+  rm -rf $NEW_DIR
+}
+
 function test_bad() {
   ( ! PYTHONPATH="${PYTHONPATH}:tableschema_to_template" \
     tableschema_to_template/ts2xl.py <(echo '{}') /tmp/should-not-exist.xlsx \
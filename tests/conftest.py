@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import pytest
+from yaml import safe_load
+
+
+@pytest.fixture(scope="module")
+def schema():
+    schema_path = Path(__file__).parent / 'fixtures/schema.yaml'
+    return safe_load(schema_path.read_text())
@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+from zipfile import ZipFile
+from io import BytesIO
+
+import pytest
+
+import create_many as create_many_module
+from create_many import create_many
+from tableschema_to_template.create_xlsx import create_xlsx
+
+
+schema_path = str(Path(__file__).parent / 'fixtures/schema.yaml')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_create_many(tmp_path, workers):
+    xlsx_path = str(tmp_path / 'template.xlsx')
+    results = create_many([
+        {'schema_path': schema_path, 'xlsx_path': xlsx_path, 'idempotent': True},
+        {'table_schema': {}, 'xlsx_path': str(tmp_path / 'bad.xlsx')},
+        {'schema_path': '/no/such/schema.yaml', 'xlsx_path': str(tmp_path / 'missing.xlsx')},
+        {'schema_path': schema_path, 'xlsx_path': None}
+    ], workers=workers)
+
+    assert [result.error is None for result in results] == [True, False, False, True]
+    assert all(result.seconds >= 0 for result in results)
+
+    assert results[0].xlsx_path == xlsx_path
+    assert ZipFile(xlsx_path).namelist()
+
+    assert results[1].error.startswith('Not a valid Table Schema:')
+    assert not (tmp_path / 'bad.xlsx').exists()
+
+    assert results[2].error.startswith('FileNotFoundError:')
+
+    assert ZipFile(BytesIO(results[3].value)).namelist()
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_create_many_relative_enum_file(tmp_path, monkeypatch, workers):
+    schema_dir = tmp_path / 'schemas'
+    schema_dir.mkdir()
+    (schema_dir / 'organs.txt').write_text('heart\nlung\n')
+    (schema_dir / 'schema.yaml').write_text(
+        'fields: [{name: organ, description: a, constraints: {enumFile: organs.txt}}]')
+    # Relative to the schema, not the working directory.
+    monkeypatch.chdir(tmp_path)
+    results = create_many(
+        [{'schema_path': 'schemas/schema.yaml', 'xlsx_path': None}], workers=workers)
+    assert results[0].error is None
+    with ZipFile(BytesIO(results[0].value)) as zip_handle:
+        assert '<t>lung</t>' in zip_handle.read('xl/worksheets/sheet2.xml').decode('utf-8')
+
+
+def create_or_crash(table_schema, xlsx_path, **kwargs):
+    if kwargs.get('sheet_name') == 'crash':
+        os._exit(1)
+    return create_xlsx(table_schema, xlsx_path, **kwargs)
+
+
+def test_create_many_crashed_worker(monkeypatch):
+    # Workers are forked, so they see the patch.
+    monkeypatch.setattr(create_many_module, 'create_xlsx', create_or_crash)
+    jobs = [{'schema_path': schema_path, 'xlsx_path': None} for i in range(6)]
+    jobs.insert(1, {'schema_path': schema_path, 'xlsx_path': None, 'sheet_name': 'crash'})
+    results = create_many(jobs, workers=2)
+    assert [result.error is None for result in results] == [True, False] + [True] * 5
+    assert results[1].error.startswith('BrokenProcessPool:')
@@ -1,18 +1,18 @@
+from io import BytesIO
 from pathlib import Path
 from zipfile import ZipFile
 import os
 
 from yattag import indent
 import pytest
-from yaml import safe_load
 
-from create_xlsx import create_xlsx
+from create_xlsx import _supports_multi_range, create_xlsx
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.timings import Timings
 
 
 @pytest.fixture(scope="module")
-def xlsx_path():
-    schema_path = Path(__file__).parent / 'fixtures/schema.yaml'
-    schema = safe_load(schema_path.read_text())
+def xlsx_path(schema):
     # Use /tmp rather than TemporaryDirectory so it can be inspected if tests fail.
     xlsx_tmp_path = '/tmp/template.xlsx'
     create_xlsx(schema, xlsx_tmp_path, idempotent=True)
@@ -57,3 +57,139 @@ unzipped_dir = 'tests/fixtures/output-unzipped'
 )
 def test_create_xlsx(xlsx_path, zip_path):
     assert_matches_fixture(xlsx_path, zip_path)
+
+
+def assert_same_contents(xlsx_path, xlsx_bytes):
+    # Timestamps inside the zip may differ, but the contents should not.
+    with ZipFile(xlsx_path) as path_zip, ZipFile(BytesIO(xlsx_bytes)) as bytes_zip:
+        assert path_zip.namelist() == bytes_zip.namelist()
+        for name in path_zip.namelist():
+            assert path_zip.read(name) == bytes_zip.read(name), f'{name} differs'
+
+
+def test_create_xlsx_bytes(schema, xlsx_path):
+    xlsx_bytes = create_xlsx(schema, None, idempotent=True)
+    assert_same_contents(xlsx_path, xlsx_bytes)
+
+
+def test_create_xlsx_file_object(schema, xlsx_path):
+    file_object = BytesIO()
+    assert create_xlsx(schema, file_object, idempotent=True) is None
+    assert_same_contents(xlsx_path, file_object.getvalue())
+
+
+def test_create_xlsx_max_rows(schema):
+    xlsx_bytes = create_xlsx(schema, None, max_rows=1000)
+    with ZipFile(BytesIO(xlsx_bytes)) as zip_handle:
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'sqref="A2:A1001"' in sheet_xml
+    assert '1048576' not in sheet_xml
+
+
+def test_create_xlsx_bad_max_rows(schema):
+    with pytest.raises(Ts2xlException, match='max_rows must be between 1 and 1048575'):
+        create_xlsx(schema, None, max_rows=0)
+
+
+def test_create_xlsx_shared_validation():
+    integer = {'type': 'integer', 'constraints': {'minimum': 1}}
+    schema = {'fields': [
+        {'name': 'a', 'description': 'a', **integer},
+        {'name': 'b', 'description': 'b', **integer},
+        {'name': 'c', 'description': 'c', 'type': 'boolean'},
+        {'name': 'd', 'description': 'd', **integer}
+    ]}
+    xlsx_bytes = create_xlsx(schema, None, max_rows=10)
+    with ZipFile(BytesIO(xlsx_bytes)) as zip_handle:
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'sqref="C2:C11"' in sheet_xml
+    if _supports_multi_range():
+        assert '<dataValidations count="2">' in sheet_xml
+        assert 'sqref="A2:B11 D2:D11"' in sheet_xml
+    else:
+        assert '<dataValidations count="3">' in sheet_xml
+        assert sheet_xml.index('sqref="A2:B11"') < sheet_xml.index('sqref="D2:D11"')
+
+
+def test_create_xlsx_shared_enum():
+    organ = {'constraints': {'enum': ['heart', 'kidney', 'liver']}}
+    schema = {'fields': [
+        {'name': 'donor organ', 'description': 'a', **organ},
+        {'name': 'other', 'description': 'b', 'constraints': {'enum': ['X']}},
+        {'name': 'recipient organ', 'description': 'c', **organ}
+    ]}
+    xlsx_bytes = create_xlsx(schema, None, max_rows=10)
+    with ZipFile(BytesIO(xlsx_bytes)) as zip_handle:
+        workbook_xml = zip_handle.read('xl/workbook.xml').decode('utf-8')
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert workbook_xml.count('<sheet ') == 3
+    assert 'name="donor organ list"' in workbook_xml
+    assert 'name="recipient organ list"' not in workbook_xml
+    if _supports_multi_range():
+        assert 'sqref="A2:A11 C2:C11"' in sheet_xml
+    else:
+        assert 'sqref="A2:A11"' in sheet_xml and 'sqref="C2:C11"' in sheet_xml
+    assert "<formula1>'donor organ list'!$A$1:$A$3</formula1>" in sheet_xml
+
+
+def test_create_xlsx_enum_file(tmp_path):
+    enum_path = tmp_path / 'organs.tsv'
+    enum_path.write_text(''.join(f'organ {i}\tUBERON:{i}\n' for i in range(100)))
+    organ = {'constraints': {'enumFile': str(enum_path)}}
+    schema = {'fields': [
+        {'name': 'donor organ', 'description': 'a', **organ},
+        {'name': 'recipient organ', 'description': 'b', **organ}
+    ]}
+    xlsx_path = tmp_path / 'template.xlsx'
+    create_xlsx(schema, str(xlsx_path), max_rows=10)
+    with ZipFile(xlsx_path) as zip_handle:
+        workbook_xml = zip_handle.read('xl/workbook.xml').decode('utf-8')
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        list_xml = zip_handle.read('xl/worksheets/sheet2.xml').decode('utf-8')
+    assert workbook_xml.count('<sheet ') == 2
+    assert 'sqref="A2:B11"' in sheet_xml
+    assert "<formula1>'donor organ list'!$A$1:$A$100</formula1>" in sheet_xml
+    assert 'Value must come from donor organ list.' in sheet_xml
+    assert '<t>organ 99</t>' in list_xml
+    assert 'UBERON' not in list_xml
+
+
+def test_create_xlsx_missing_enum_file(tmp_path):
+    schema = {'fields': [
+        {'name': 'organ', 'description': 'a', 'constraints': {'enumFile': '/no/such/file'}}
+    ]}
+    with pytest.raises(Ts2xlException, match='Could not read enumFile'):
+        create_xlsx(schema, str(tmp_path / 'template.xlsx'))
+
+
+def test_create_xlsx_timings(schema, tmp_path):
+    phases = []
+    timings = Timings(callback=lambda name, seconds: phases.append(name))
+    xlsx_path = tmp_path / 'template.xlsx'
+    create_xlsx(schema, str(xlsx_path), timings=timings)
+    assert phases == ['validate_schema', 'fields', 'data_validation', 'close']
+    timings_dict = timings.to_dict()
+    assert [field['name'] for field in timings_dict['fields']] == \
+        [field['name'] for field in schema['fields']]
+    assert set(timings_dict['fields'][0]) == \
+        {'name', 'write', 'write_comment', 'get_validation'}
+    assert timings_dict['output_bytes'] == xlsx_path.stat().st_size
+
+    timings = Timings()
+    xlsx_bytes = create_xlsx(schema, None, timings=timings)
+    assert timings.output_bytes == len(xlsx_bytes)
+
+
+def test_create_xlsx_low_memory(schema):
+    xlsx_bytes = create_xlsx(schema, None, idempotent=True, low_memory=True)
+    with ZipFile(BytesIO(xlsx_bytes)) as zip_handle:
+        names = zip_handle.namelist()
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    # Strings are written inline, instead of in a shared table.
+    assert 'xl/sharedStrings.xml' not in names
+    assert 't="inlineStr"' in sheet_xml
+    assert '<dataValidations count=' in sheet_xml
+
+    xlsx_file = BytesIO()
+    create_xlsx(schema, xlsx_file, idempotent=True, low_memory=True)
+    assert xlsx_file.getvalue() == xlsx_bytes
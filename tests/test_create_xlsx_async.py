@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from threading import Event
+from zipfile import ZipFile
+import asyncio
+
+import pytest
+
+from create_xlsx_async import AsyncCreator, create_xlsx_async
+from tableschema_to_template.errors import Ts2xlException
+
+
+def run(coroutine):
+    # asyncio.run() is not available in Python 3.6.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_create_xlsx_async(schema, tmp_path):
+    async def create_all():
+        return await asyncio.gather(*[
+            create_xlsx_async(schema, str(tmp_path / f'{i}.xlsx'), idempotent=True)
+            for i in range(5)
+        ], create_xlsx_async(schema, idempotent=True))
+    *nones, xlsx_bytes = run(create_all())
+    assert nones == [None] * 5
+    assert (tmp_path / '4.xlsx').read_bytes()
+    assert ZipFile(BytesIO(xlsx_bytes)).namelist()
+
+
+def test_create_xlsx_async_error():
+    with pytest.raises(Ts2xlException, match='Not a valid Table Schema'):
+        run(create_xlsx_async({}))
+
+
+def test_create_xlsx_async_process_pool(schema):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        creator = AsyncCreator(max_concurrency=2, executor=executor)
+        xlsx_bytes = run(creator.create_xlsx(schema))
+    assert ZipFile(BytesIO(xlsx_bytes)).namelist()
+
+
+def test_create_xlsx_async_cancel(schema, tmp_path):
+    creator = AsyncCreator(max_concurrency=1)
+    started = Event()
+    release = Event()
+    # Occupy the only worker, so the next build has to wait.
+    creator.executor.submit(lambda: started.set() or release.wait())
+    started.wait()
+
+    async def create_and_cancel():
+        task = asyncio.ensure_future(creator.create_xlsx(schema, str(tmp_path / 'x.xlsx')))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    run(create_and_cancel())
+    release.set()
+    creator.shutdown()
+    assert not (tmp_path / 'x.xlsx').exists()
@@ -0,0 +1,79 @@
+import socket
+from pathlib import Path
+from threading import Thread
+from zipfile import ZipFile
+
+import pytest
+
+from daemon import make_server, send_request
+from tableschema_to_template.errors import Ts2xlException
+
+
+schema_text = (Path(__file__).parent / 'fixtures/schema.yaml').read_text()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    socket_path = str(tmp_path / 'ts2xl.sock')
+    server = make_server(socket_path)
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_daemon(socket_path, tmp_path):
+    xlsx_path = tmp_path / 'template.xlsx'
+    assert send_request(socket_path, schema_text, str(xlsx_path), {'idempotent': True})
+    assert ZipFile(xlsx_path).namelist()
+
+
+def test_daemon_relative_enum_file(socket_path, tmp_path):
+    (tmp_path / 'organs.txt').write_text('heart\nlung\n')
+    schema_text = (
+        '{"fields": [{"name": "organ", "description": "a", '
+        '"constraints": {"enumFile": "organs.txt"}}]}')
+    xlsx_path = tmp_path / 'template.xlsx'
+    assert send_request(socket_path, schema_text, str(xlsx_path), {}, str(tmp_path))
+    assert ZipFile(xlsx_path).namelist()
+
+
+def test_daemon_error(socket_path, tmp_path):
+    with pytest.raises(Ts2xlException, match='Not a valid Table Schema'):
+        send_request(socket_path, '{}', str(tmp_path / 'template.xlsx'), {})
+
+
+def test_daemon_already_listening(socket_path):
+    with pytest.raises(Ts2xlException, match='already listening'):
+        make_server(socket_path)
+
+
+def test_no_daemon(tmp_path):
+    socket_path = str(tmp_path / 'missing.sock')
+    assert not send_request(socket_path, schema_text, str(tmp_path / 'template.xlsx'), {})
+
+
+def test_no_daemon_bad_path(tmp_path):
+    # Connecting raises NotADirectoryError: Any OSError should fall back.
+    (tmp_path / 'file').write_text('')
+    socket_path = str(tmp_path / 'file' / 'ts2xl.sock')
+    assert not send_request(socket_path, schema_text, str(tmp_path / 'template.xlsx'), {})
+
+
+def test_daemon_reset(tmp_path):
+    socket_path = str(tmp_path / 'reset.sock')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen(1)
+
+        def reset():
+            connection, address = listener.accept()
+            # Closing with unread data sends a reset, like a daemon that died.
+            connection.recv(1)
+            connection.close()
+        thread = Thread(target=reset)
+        thread.start()
+        assert not send_request(socket_path, schema_text, str(tmp_path / 'template.xlsx'), {})
+        thread.join()
@@ -0,0 +1,87 @@
+from io import BytesIO
+from pathlib import Path
+from threading import Thread
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from zipfile import ZipFile
+
+import pytest
+
+from http_server import TemplateHTTPServer
+
+
+schema_bytes = (Path(__file__).parent / 'fixtures/schema.yaml').read_bytes()
+
+
+@pytest.fixture
+def server():
+    server = TemplateHTTPServer(('127.0.0.1', 0), cache_size=2, max_builds=1)
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(server, body, query='', headers={}):
+    url = f'http://127.0.0.1:{server.server_address[1]}/?{query}'
+    return urlopen(Request(url, data=body, headers=headers), timeout=10)
+
+
+def test_http_server(server):
+    with post(server, schema_bytes, 'sheet_name=Data') as response:
+        etag = response.headers['ETag']
+        xlsx_bytes = response.read()
+    assert 'xl/worksheets/sheet1.xml' in ZipFile(BytesIO(xlsx_bytes)).namelist()
+
+    with post(server, schema_bytes, 'sheet_name=Data') as response:
+        assert response.headers['ETag'] == etag
+        assert response.read() == xlsx_bytes
+    assert server.cache.info().hits == 1
+
+    with pytest.raises(HTTPError) as e:
+        post(server, schema_bytes, 'sheet_name=Data', {'If-None-Match': etag})
+    assert e.value.code == 304
+
+    with post(server, schema_bytes, 'sheet_name=Other') as response:
+        assert response.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('body,query,message', [
+    (b'{}', '', "Not a valid Table Schema: 'fields'"),
+    (b'{', '', 'Not JSON or YAML'),
+    (schema_bytes, 'max_rows=0', 'max_rows must be between'),
+    (b'{"fields": [{"name": "a", "constraints": {"enumFile": "/etc/passwd"}}]}', '',
+     'enumFile is not supported over HTTP')
+])
+def test_http_server_errors(server, body, query, message):
+    with pytest.raises(HTTPError) as e:
+        post(server, body, query)
+    assert e.value.code == 400
+    assert message in e.value.read().decode('utf-8')
+
+
+def test_http_server_negative_length(server):
+    with pytest.raises(HTTPError) as e:
+        post(server, schema_bytes, headers={'Content-Length': '-1'})
+    assert e.value.code == 400
+    assert 'must not be negative' in e.value.read().decode('utf-8')
+
+
+def test_http_server_unexpected_error(server):
+    # Valid, but create_xlsx() expects a description.
+    with pytest.raises(HTTPError) as e:
+        post(server, b'{"fields": [{"name": "a"}]}')
+    assert e.value.code == 500
+    assert 'KeyError' in e.value.read().decode('utf-8')
+
+
+def test_http_server_etag_versions(server):
+    with post(server, schema_bytes) as response:
+        etag = response.headers['ETag']
+    # As if xlsxwriter were upgraded.
+    server.versions = {**server.versions, 'xlsxwriter_version': '0.0.0'}
+    with post(server, schema_bytes, headers={'If-None-Match': etag}) as response:
+        assert response.status == 200
+        assert response.headers['ETag'] != etag
@@ -0,0 +1,44 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+
+# Cumulative microseconds for "import tableschema_to_template".
+# Well above what's measured locally, to allow for slow CI machines.
+import_budget = 100000
+
+# Each of these takes longer to import than the budget allows.
+heavy_modules = ['xlsxwriter', 'jsonschema', 'yaml']
+
+
+def get_import_times(module):
+    '''
+    Returns a dict of cumulative microseconds for each module imported,
+    as reported by "python -X importtime".
+    '''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # Lines look like: "import time:       295 |      84897 |       jsonschema"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='-X importtime is new in Python 3.7')
+def test_import_time():
+    times = get_import_times('tableschema_to_template')
+    for heavy_module in heavy_modules:
+        assert heavy_module not in times, \
+            f'"{heavy_module}" should only be imported when first used'
+    assert times['tableschema_to_template'] < import_budget, \
+        f'Import took {times["tableschema_to_template"]}us; budget is {import_budget}us'
@@ -0,0 +1,59 @@
+import csv
+import random
+
+import pytest
+
+from tableschema_to_template import read_tsv
+from tableschema_to_template.read_tsv import read_tsv_columns, read_tsv_header
+
+
+def read_with_csv(tsv_path, indexes):
+    with open(tsv_path, newline='', encoding='utf-8') as tsv_file:
+        rows = list(csv.reader(tsv_file, delimiter='\t'))
+    return len(rows), [[row[i] if i < len(row) else '' for row in rows] for i in indexes]
+
+
+def read_all(tsv_path, indexes, start=0, end=None):
+    row_count = 0
+    columns = [[] for i in indexes]
+    for block_row_count, block_columns in read_tsv_columns(tsv_path, indexes, start, end):
+        row_count += block_row_count
+        for column, block_column in zip(columns, block_columns):
+            assert len(block_column) == block_row_count
+            column.extend(block_column)
+    return row_count, columns
+
+
+@pytest.mark.parametrize('block_bytes', [2**22, 7])
+@pytest.mark.parametrize('line_end', ['\n', '\r\n'])
+def test_read_tsv_like_csv(tmp_path, monkeypatch, block_bytes, line_end):
+    monkeypatch.setattr(read_tsv, '_block_bytes', block_bytes)
+    words = ['', 'a', 'bc', 'é', '1.5', 'long ' * 10]
+    random.seed(0)
+    lines = [
+        '\t'.join(random.choice(words) for _ in range(random.randrange(6)))
+        for _ in range(200)
+    ]
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_bytes(line_end.join(lines).encode('utf-8'))
+    for indexes in [[], [0], [1, 4], [5, 0]]:
+        assert read_all(str(tsv_path), indexes) == read_with_csv(tsv_path, indexes)
+
+
+@pytest.mark.parametrize('block_bytes', [2**22, 7])
+def test_read_tsv_falls_back_to_csv(tmp_path, monkeypatch, block_bytes):
+    monkeypatch.setattr(read_tsv, '_block_bytes', block_bytes)
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_text('a\tb\n' * 5 + '"x\ny"\tz\n' + 'old\tmac\rc\td\n', newline='')
+    assert read_all(str(tsv_path), [0, 1]) == read_with_csv(tsv_path, [0, 1])
+    assert read_all(str(tsv_path), [0])[1][0][5:] == ['x\ny', 'old', 'c']
+
+
+def test_read_tsv_range(tmp_path):
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_text('\ufeffname\tvalue\nx\t1\ny\t2\nz\t3\n', encoding='utf-8')
+    header, start = read_tsv_header(str(tsv_path))
+    assert header == ['name', 'value']
+    assert read_all(str(tsv_path), [1], start, start + 8) == (2, [['1', '2']])
+    assert read_all(str(tsv_path), [1], start + 8) == (1, [['3']])
+    assert read_all(str(tsv_path), [1], start + 12) == (0, [[]])
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import template_cache
+from template_cache import TemplateCache
+from tableschema_to_template.errors import Ts2xlException
+
+
+@pytest.mark.parametrize('hardlink', [False, True])
+def test_template_cache(schema, tmp_path, hardlink):
+    cache = TemplateCache(str(tmp_path / 'cache'), hardlink=hardlink)
+    first_path = tmp_path / 'first.xlsx'
+    second_path = tmp_path / 'second.xlsx'
+
+    cache.create_xlsx(schema, str(first_path), idempotent=True)
+    cache.create_xlsx(schema, str(second_path), idempotent=True)
+    xlsx_bytes = cache.create_xlsx(schema, None, idempotent=True)
+
+    info = cache.info()
+    assert (info.hits, info.misses) == (2, 1)
+    assert info.currsize == len(xlsx_bytes)
+    assert first_path.read_bytes() == second_path.read_bytes() == xlsx_bytes
+    assert (os.stat(second_path).st_nlink > 1) == hardlink
+
+
+def test_template_cache_key(schema, tmp_path):
+    cache = TemplateCache(str(tmp_path / 'cache'))
+    cache.create_xlsx(schema, None, idempotent=True)
+    cache.create_xlsx(schema, None, idempotent=True, sheet_name='Other')
+    cache.create_xlsx(schema, None, idempotent=True, max_rows=10)
+    # Not idempotent, so not cached:
+    cache.create_xlsx(schema, None)
+    info = cache.info()
+    assert (info.hits, info.misses) == (0, 3)
+
+
+def test_template_cache_version(schema, tmp_path, monkeypatch):
+    cache = TemplateCache(str(tmp_path / 'cache'))
+    cache.create_xlsx(schema, None, idempotent=True)
+    # As if the code changed in a checkout:
+    monkeypatch.setattr(template_cache, 'get_version', lambda: '0.0.0+changed')
+    cache.create_xlsx(schema, None, idempotent=True)
+    info = cache.info()
+    assert (info.hits, info.misses) == (0, 2)
+
+
+def test_template_cache_eviction(schema, tmp_path):
+    cache = TemplateCache(str(tmp_path / 'cache'), max_bytes=1)
+    cache.create_xlsx(schema, None, idempotent=True)
+    cache.create_xlsx(schema, None, idempotent=True)
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (0, 2, 0)
+
+
+def test_template_cache_invalid(tmp_path):
+    cache = TemplateCache(str(tmp_path / 'cache'))
+    with pytest.raises(Ts2xlException, match='Not a valid Table Schema'):
+        cache.create_xlsx({}, None, idempotent=True)
+    assert os.listdir(tmp_path / 'cache') == []
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from tableschema_to_template import validate_columns
+from tableschema_to_template.validate_columns import get_column_errors
+from tableschema_to_template.validation_factory import get_validation
+
+
+fields = [
+    {'name': 'number', 'type': 'number', 'constraints': {'minimum': -1.5, 'maximum': 100}},
+    {'name': 'integer', 'type': 'integer', 'constraints': {'minimum': 0}},
+    {'name': 'integer', 'type': 'integer'},
+    {'name': 'boolean', 'type': 'boolean'},
+    {'name': 'enum', 'constraints': {'enum': ['A', 'B']}}
+]
+
+texts = [
+    '', '0', '1', '-1', '-2', '2.5', '100', '100.5', '1e2', '1e400', 'nan', 'inf',
+    ' 7 ', 'x', 'TRUE', 'false', 'tRuE', 'yes', 'A', 'a', '2147483648',
+    '9007199254740993', '-9007199254740993.0', '1_000'
+]
+
+
+def get_row_wise_errors(validation, values):
+    return [
+        (i, validation.get_error(value))
+        for i, value in enumerate(values)
+        if value is not None and value != '' and validation.get_error(value) is not None
+    ]
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize('field', fields, ids=[field.get('type', 'enum') for field in fields])
+def test_same_as_row_wise(field, use_numpy, monkeypatch):
+    if use_numpy and validate_columns.numpy is None:
+        pytest.skip('NumPy is not installed')
+    if not use_numpy:
+        monkeypatch.setattr(validate_columns, 'numpy', None)
+    validation = get_validation(field, None)
+    rng = random.Random(0)
+    for values in [
+        texts,
+        # All valid, so NumPy can convert the whole batch.
+        [rng.choice(['', '0', '1', '42', 'TRUE', 'A']) for _ in range(1000)],
+        # From Excel, values may be numbers, booleans, or missing.
+        [rng.choice([None, 1, 2.5, -3, True, 'x', '5']) for _ in range(1000)]
+    ]:
+        assert get_column_errors(validation, values) == get_row_wise_errors(validation, values)
@@ -0,0 +1,145 @@
+import json
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+from xlsxwriter import Workbook
+
+from tableschema_to_template import create_xlsx, validate_data as validate_data_module
+from tableschema_to_template.errors import Ts2xlException
+from tableschema_to_template.read_xlsx import read_xlsx
+from tableschema_to_template.validate_data import validate_data
+
+
+schema_path = Path(__file__).parent / 'fixtures/schema.yaml'
+
+
+header = ['abc', 'xyz', 'string', 'number', 'integer', 'boolean']
+
+
+def test_validate_tsv(schema, tmp_path):
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_text(''.join('\t'.join(row) + '\n' for row in [
+        header,
+        ['A', 'X', 'anything', '0.5', '10', 'TRUE'],
+        ['', '', '', '', '', ''],
+        ['D', 'Y', 'anything', '-1', '1.5', 'yes']
+    ]))
+    assert list(validate_data(schema, str(tsv_path))) == [
+        {'row': 4, 'column': 'abc', 'value': 'D', 'error': 'Value must be one of: A / B / C.'},
+        {'row': 4, 'column': 'number', 'value': '-1',
+         'error': 'The values in this column must be numbers >= 0.'},
+        {'row': 4, 'column': 'integer', 'value': '1.5',
+         'error': 'The values in this column must be integers between 1 and 10.'},
+        {'row': 4, 'column': 'boolean', 'value': 'yes',
+         'error': 'The values in this column must be "TRUE" or "FALSE".'}
+    ]
+
+
+def test_validate_tsv_header(schema, tmp_path):
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_text('abc\textra\nA\tanything\n')
+    problems = list(validate_data(schema, str(tsv_path)))
+    assert {'row': 1, 'column': 'xyz', 'value': None, 'error': 'Column is missing'} in problems
+    assert {
+        'row': 1, 'column': 'extra', 'value': 'extra', 'error': 'Column is not in the schema'
+    } in problems
+    assert all(problem['row'] == 1 for problem in problems)
+
+
+def test_validate_tsv_workers(schema, tmp_path, monkeypatch):
+    tsv_path = tmp_path / 'data.tsv'
+    rows = [header] + [
+        # Blank lines, and Windows line endings, are counted as rows.
+        [] if i % 7 == 0 else ['A' if i % 3 else 'D', 'X', '', str(i - 50), '5', 'TRUE']
+        for i in range(100)
+    ]
+    tsv_path.write_bytes(''.join('\t'.join(row) + '\r\n' for row in rows).encode('utf-8-sig'))
+    serial = list(validate_data(schema, str(tsv_path)))
+    # Small chunks, so there are many, and they split rows at odd offsets.
+    monkeypatch.setattr(validate_data_module, '_chunk_bytes', 50)
+    assert list(validate_data(schema, str(tsv_path), workers=2)) == serial
+    assert len(serial) > 50 and serial[-1]['row'] == 101
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('text', ['abc\tcafé\n', 'abc\nA\ncafé\n'])
+def test_validate_tsv_not_utf8(schema, tmp_path, workers, text):
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_bytes(text.encode('cp1252'))
+    with pytest.raises(Ts2xlException, match='Could not read data: .*not UTF-8'):
+        list(validate_data(schema, str(tsv_path), workers=workers))
+
+
+def test_validate_tsv_shared_enum(tmp_path):
+    enum = {'constraints': {'enum': [f'value {i}' for i in range(10)]}}
+    schema = {'fields': [
+        {'name': 'first', 'description': 'a', **enum},
+        {'name': 'second', 'description': 'b', **enum}
+    ]}
+    # The template has one list sheet, named for the first field.
+    with ZipFile(BytesIO(create_xlsx(schema, None))) as zip_handle:
+        sheet_xml = zip_handle.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'Value must come from first list.' in sheet_xml
+
+    tsv_path = tmp_path / 'data.tsv'
+    # Columns need not be in schema order.
+    tsv_path.write_text('second\tfirst\nbad\tbad\n')
+    assert [problem['error'] for problem in validate_data(schema, str(tsv_path))] == [
+        'Value must come from first list.'
+    ] * 2
+
+
+def test_validate_xlsx(schema, tmp_path):
+    xlsx_path = str(tmp_path / 'data.xlsx')
+    workbook = Workbook(xlsx_path)
+    sheet = workbook.add_worksheet('Export this as TSV')
+    sheet.write_row(0, 0, header)
+    sheet.write_row(1, 0, ['B', 'Z', 'anything', 2.5, 3, True])
+    # A gap, then a row with numbers where strings are expected, and the reverse.
+    sheet.write_row(4, 0, ['C', 7, None, 'many', 11.0, False])
+    workbook.add_worksheet('other').write(0, 0, 'not checked')
+    workbook.close()
+
+    assert [
+        (problem['row'], problem['column'], problem['value'])
+        for problem in validate_data(schema, xlsx_path)
+    ] == [(5, 'xyz', 7), (5, 'number', 'many'), (5, 'integer', 11)]
+
+
+def test_read_xlsx(tmp_path):
+    xlsx_path = str(tmp_path / 'data.xlsx')
+    workbook = Workbook(xlsx_path)
+    workbook.add_worksheet('first').write(0, 0, 'skipped')
+    sheet = workbook.add_worksheet('second')
+    sheet.write_row(0, 0, ['text', 1, 1.5, True])
+    sheet.write(2, 2, 'gap')
+    sheet.write_rich_string(3, 0, 'rich ', workbook.add_format({'bold': True}), 'text')
+    workbook.close()
+
+    assert list(read_xlsx(xlsx_path, 'second')) == [
+        (1, ['text', 1, 1.5, True]),
+        (3, [None, None, 'gap']),
+        (4, ['rich text'])
+    ]
+    with pytest.raises(Ts2xlException, match='No sheet named "third"'):
+        list(read_xlsx(xlsx_path, 'third'))
+
+
+def test_validate_data_cli(tmp_path):
+    tsv_path = tmp_path / 'data.tsv'
+    tsv_path.write_text('abc\nA\nD\nE\n')
+    result = subprocess.run(
+        [
+            sys.executable, '-m', 'tableschema_to_template.validate_data',
+            str(schema_path), str(tsv_path), '--max_errors', '2'
+        ],
+        stdout=subprocess.PIPE, universal_newlines=True
+    )
+    lines = result.stdout.splitlines()
+    assert result.returncode == 1
+    assert len(lines) == 2
+    assert json.loads(lines[0])['column'] == 'xyz'
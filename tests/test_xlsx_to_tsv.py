@@ -0,0 +1,82 @@
+from datetime import datetime
+from io import StringIO
+from zipfile import ZipFile
+
+import pytest
+from xlsxwriter import Workbook
+
+from tableschema_to_template.read_xlsx import read_xlsx
+from tableschema_to_template.xlsx_to_tsv import xlsx_to_tsv
+
+
+def test_xlsx_to_tsv(tmp_path):
+    xlsx_path = str(tmp_path / 'data.xlsx')
+    workbook = Workbook(xlsx_path)
+    sheet = workbook.add_worksheet('Export this as TSV')
+    sheet.write_row(0, 0, ['name', 'count', 'ok'])
+    sheet.write_row(1, 0, ['tab\there', 2.0, True])
+    sheet.write_row(3, 0, ['after a gap', 0.5, False])
+    workbook.close()
+
+    tsv_file = StringIO()
+    xlsx_to_tsv(xlsx_path, tsv_file)
+    assert tsv_file.getvalue() == (
+        'name\tcount\tok\n'
+        '"tab\there"\t2\tTRUE\n'
+        '\n'
+        'after a gap\t0.5\tFALSE\n'
+    )
+
+
+def test_xlsx_to_tsv_dates(tmp_path):
+    xlsx_path = str(tmp_path / 'data.xlsx')
+    workbook = Workbook(xlsx_path)
+    sheet = workbook.add_worksheet()
+    when = datetime(2021, 1, 31, 18, 30)
+    sheet.write_datetime(0, 0, when, workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'}))
+    sheet.write_datetime(0, 1, when, workbook.add_format({'num_format': 14}))
+    sheet.write_datetime(0, 2, when, workbook.add_format({'num_format': 'h:mm AM/PM'}))
+    sheet.write_number(0, 3, 1.5, workbook.add_format({'num_format': '[h]:mm'}))
+    sheet.write_number(0, 4, 1.5, workbook.add_format({'num_format': '0.00', 'bold': True}))
+    workbook.close()
+
+    tsv_file = StringIO()
+    xlsx_to_tsv(xlsx_path, tsv_file)
+    assert tsv_file.getvalue() == '2021-01-31 18:30:00\t2021-01-31\t18:30:00\t1.5\t1.5\n'
+    # By default, dates are numbers.
+    assert list(read_xlsx(xlsx_path))[0][1][0] == pytest.approx(44227 + 18.5 / 24)
+
+
+def test_read_xlsx_prefixed(tmp_path):
+    # Some writers use a namespace prefix, inline strings, and phonetic hints.
+    main_ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    rel_ns = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    xlsx_path = str(tmp_path / 'data.xlsx')
+    with ZipFile(xlsx_path, 'w') as zip_file:
+        zip_file.writestr('xl/workbook.xml', f'''
+            <x:workbook xmlns:x="{main_ns}" xmlns:r="{rel_ns}">
+              <x:sheets><x:sheet name="Data" sheetId="1" r:id="rId1"/></x:sheets>
+            </x:workbook>''')
+        zip_file.writestr('xl/_rels/workbook.xml.rels', '''
+            <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+              <Relationship Id="rId1" Target="/xl/worksheets/data.xml" Type="worksheet"/>
+            </Relationships>''')
+        zip_file.writestr('xl/sharedStrings.xml', f'''
+            <x:sst xmlns:x="{main_ns}">
+              <x:si><x:t>plain &amp; simple</x:t></x:si>
+              <x:si><x:r><x:t>ri</x:t></x:r><x:r><x:t>ch</x:t></x:r>
+                <x:rPh><x:t>hint</x:t></x:rPh></x:si>
+            </x:sst>''')
+        zip_file.writestr('xl/worksheets/data.xml', f'''
+            <x:worksheet xmlns:x="{main_ns}"><x:sheetData>
+              <x:row r="2">
+                <x:c r="B2" t="s"><x:v>1</x:v></x:c>
+                <x:c r="C2" t="inlineStr"><x:is><x:t>inline</x:t></x:is></x:c>
+                <x:c r="D2"><x:f>1+1</x:f><x:v>2</x:v></x:c>
+                <x:c r="E2" s="1"/>
+                <x:c r="F2" t="s"><x:v>0</x:v></x:c>
+              </x:row>
+            </x:sheetData></x:worksheet>''')
+    assert list(read_xlsx(xlsx_path)) == [
+        (2, [None, 'rich', 'inline', 2, None, 'plain & simple'])
+    ]